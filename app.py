@@ -1,35 +1,51 @@
 import os
-import time
-import shutil
-import re
-from typing import List
+import socket
+import uuid
+from typing import List, Optional
 
-from fastapi import FastAPI, Request, UploadFile, File, Form
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, UploadFile, File, Form, HTTPException
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from processing.cleaner import clean_text
-from processing.hasher import get_hash
-from processing.resume_loader import load_resume_text
-from processing.tfidf import compute_tfidf_similarity
-
 from llm.hf_runner import run_llm
-from llm.prompts import (
-    JD_STRUCTURING_PROMPT,
-    RESUME_STRUCTURING_PROMPT,
-    SCORING_PROMPT
+
+from db.database import init_db, get_jd_by_hash, get_llm_remarks
+from db.analytics import (
+    iter_ranking_pages,
+    get_requisition_summaries,
+    get_score_distribution,
+    get_skill_gap_frequency
+)
+from db.queue import (
+    enqueue_jobs,
+    get_batch_jobs,
+    get_batch_status,
+    try_acquire_lock
 )
 
-from db.database import (
-    init_db,
-    save_jd,
-    save_resume,
-    save_score,
-    get_score_by_jd_and_resume
+from pipeline import (
+    ResumeSkipped,
+    JDStructuringFailed,
+    prepare_jd,
+    save_upload,
+    discard_upload,
+    screen_resume,
+    screen_batch
 )
 
-from config import GROQ_MODEL
+from processing.ranking import ResultRecord, ResultCollector, LazyResults
+from processing.export import ranking_csv_chunks, ranking_parquet_chunks
+
+from schemas import BatchAnalysisResponse, JDAnalytics, RequisitionSummary
+
+from config import (
+    DEPLOYMENT_MODE,
+    WARMUP_LOCK_SECONDS,
+    RESULTS_TOP_K,
+    SHORTLIST_CUTOFF,
+    EXPORT_PAGE_SIZE
+)
 
 
 # --------------------------------------------------
@@ -43,21 +59,25 @@ templates = Jinja2Templates(directory="templates")
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+PROCESS_ID = f"{socket.gethostname()}:{os.getpid()}"
+
 
 # --------------------------------------------------
-# INIT DB
+# STARTUP (runs once per uvicorn worker process)
 # --------------------------------------------------
-init_db()
+@app.on_event("startup")
+def startup():
+    init_db()
 
+    # 🔥 MODEL WARM-UP (SAFE) — one process per interval, not one per worker
+    if not try_acquire_lock("warmup", PROCESS_ID, WARMUP_LOCK_SECONDS):
+        return
 
-# --------------------------------------------------
-# 🔥 MODEL WARM-UP (SAFE)
-# --------------------------------------------------
-print("Warming up model...")
-try:
-    run_llm("Say READY", "ping", 5)
-except Exception:
-    pass
+    print("Warming up model...")
+    try:
+        run_llm("Say READY", "ping", 5)
+    except Exception:
+        pass
 
 
 # --------------------------------------------------
@@ -75,35 +95,51 @@ def home(request: Request):
 async def analyze(
     request: Request,
     jd_text: str = Form(...),
-    resumes: List[UploadFile] = File(...)
+    resumes: List[UploadFile] = File(...),
+    top_k: Optional[int] = Form(None, ge=1)
 ):
-    results = []
+    # Compact records only; reasons are read back from `scores` at render time
+    results = ResultCollector(top_k=top_k or RESULTS_TOP_K)
 
     # --------------------------------------------------
     # 📄 JD PROCESSING
     # --------------------------------------------------
-    jd_clean = clean_text(jd_text)
-    jd_hash = get_hash(jd_clean)
-
     try:
-        jd_structured = run_llm(
-            JD_STRUCTURING_PROMPT,
-            jd_clean,
-            max_tokens=300
-        )
+        jd = prepare_jd(jd_text)
     except Exception:
         return templates.TemplateResponse(
             "error.html",
             {"request": request, "error": "JD structuring failed"}
         )
 
-    save_jd(
-        jd_hash=jd_hash,
-        raw_text=jd_clean,
-        structured_text=jd_structured
-    )
+    # --------------------------------------------------
+    # 📬 QUEUE MODE: hand resumes to worker.py processes
+    # --------------------------------------------------
+    if DEPLOYMENT_MODE == "queue":
+        batch_id = uuid.uuid4().hex
+        payloads = []
+
+        for file in resumes:
+            try:
+                payloads.append({
+                    "jd_hash": jd["jd_hash"],
+                    "file_path": save_upload(file, UPLOAD_DIR),
+                    "filename": file.filename
+                })
+            except Exception as e:
+                print(f"Skipping {file.filename}: read_failed | {e}")
+            finally:
+                await file.close()
+
+        if not payloads:
+            return templates.TemplateResponse(
+                "error.html",
+                {"request": request, "error": "None of the uploaded resumes could be saved"}
+            )
 
-    time.sleep(2)
+        enqueue_jobs(batch_id, "screen_resume", payloads)
+
+        return RedirectResponse(f"/batches/{batch_id}", status_code=303)
 
     # --------------------------------------------------
     # 📑 RESUME PROCESSING
@@ -113,117 +149,64 @@ async def analyze(
         print(f"Analyzing {filename}")
 
         try:
-            file_path = os.path.join(UPLOAD_DIR, filename)
-            with open(file_path, "wb") as f:
-                shutil.copyfileobj(file.file, f)
-
-            resume_raw = load_resume_text(file_path)
-            resume_clean = clean_text(resume_raw)
-            resume_hash = get_hash(resume_clean)
-
+            file_path = save_upload(file, UPLOAD_DIR)
         except Exception as e:
             print(f"Skipping {filename}: read_failed | {e}")
             continue
+        finally:
+            # Frees the spooled temp file now. The UploadFile object itself
+            # stays referenced by the request's cached form until the response.
+            await file.close()
 
-        # ---------- Resume Structuring ----------
         try:
-            resume_structured = run_llm(
-                RESUME_STRUCTURING_PROMPT,
-                resume_clean,
-                max_tokens=450
-            )
-        except Exception as e:
-            print(f"Skipping {filename}: structuring_failed | {e}")
+            result = screen_resume(jd, file_path, filename)
+        except ResumeSkipped as e:
+            print(f"Skipping {filename}: {e}")
             continue
+        finally:
+            discard_upload(file_path)
 
-        save_resume(
-            resume_hash=resume_hash,
-            filename=filename,
-            raw_text=resume_clean,
-            structured_text=resume_structured
-        )
-
-        time.sleep(2)
-
-        # ---------- TF-IDF Similarity (LOGGING ONLY) ----------
-        tfidf_similarity = compute_tfidf_similarity(
-            jd_clean,
-            resume_clean
-        )
-
-        save_score(
-            jd_hash=jd_hash,
-            resume_hash=resume_hash,
-            score_type="tfidf",
-            score_value=tfidf_similarity,
-            remarks="TF-IDF cosine similarity"
-        )
-
-        # ---------- LLM Scoring ----------
-        score = 0
-        reason = "LLM scoring failed"
+        results.add(ResultRecord(
+            result["resume_hash"],
+            filename,
+            result["score"],
+            result["similarity"]
+        ))
 
-        existing_score = get_score_by_jd_and_resume(jd_hash, resume_hash, "llm")
+    # --------------------------------------------------
+    # FINAL SORT (LLM SCORE FIRST, TF-IDF AS TIEBREAKER)
+    # --------------------------------------------------
+    screened = results.seen
+    ranked = LazyResults(
+        results.ranked(),
+        lambda hashes: get_llm_remarks(jd["jd_hash"], hashes)
+    )
 
-        if existing_score:
-            score = existing_score["score_value"]
-            reason = existing_score["remarks"]
-            print(f"✅ Using cached LLM score: {score}")
-        else:
-            try:
-                score_text = run_llm(
-                    SCORING_PROMPT,
-                    "JOB REQUIREMENTS:\n"
-                    + jd_structured
-                    + "\n\nCANDIDATE PROFILE:\n"
-                    + resume_structured,
-                    max_tokens=200
-                )
-
-                # ---------- 🔧 FIXED: ROBUST SCORE + REASON EXTRACTION ----------
-                score_match = re.search(r"\b(1[5-9]|[2-8][0-9]|90)\b", score_text)
-
-                if score_match:
-                    score = int(score_match.group(1))
-                    reason = score_text[score_match.end():].strip()
-                else:
-                    score = 15
-                    reason = score_text.strip()
-
-                score = min(90, max(15, score))
-                # ---------------------------------------------------------------
-
-                save_score(
-                    jd_hash=jd_hash,
-                    resume_hash=resume_hash,
-                    score_type="llm",
-                    score_value=score,
-                    remarks=reason,
-                    model_name=GROQ_MODEL
-                )
+    return templates.TemplateResponse(
+        "results.html",
+        {
+            "request": request,
+            "jd_summary": jd["structured"],
+            "results": ranked,
+            "screened": screened
+        }
+    )
 
-            except Exception as e:
-                print(f"LLM scoring failed for {filename}: {e}")
 
-        results.append({
-            "name": filename,
-            "score": score,
-            "similarity": tfidf_similarity,
-            "reason": reason
-        })
+@app.get("/batches/{batch_id}", response_class=HTMLResponse)
+def batch_results(request: Request, batch_id: str):
+    """
+    Results page for a queued /analyze batch; refreshes itself until every job is done.
+    """
+    jobs = get_batch_jobs(batch_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail="Unknown batch")
 
-        print("--------------------------------------------------")
-        print(f"Resume     : {filename}")
-        print(f"LLM Score  : {score}")
-        print(f"TF-IDF %   : {tfidf_similarity}")
-        print(f"Reason     : {reason}")
-        print("--------------------------------------------------\n")
+    jd = get_jd_by_hash(jobs[0]["payload"]["jd_hash"])
 
-        time.sleep(2)
+    results = [job["result"] for job in jobs if job["status"] == "done"]
+    pending = sum(1 for job in jobs if job["status"] in ("queued", "running"))
 
-    # --------------------------------------------------
-    # FINAL SORT (LLM SCORE FIRST, TF-IDF AS TIEBREAKER)
-    # --------------------------------------------------
     results.sort(
         key=lambda x: (x["score"], x["similarity"]),
         reverse=True
@@ -233,7 +216,102 @@ async def analyze(
         "results.html",
         {
             "request": request,
-            "jd_summary": jd_structured,
-            "results": results
+            "jd_summary": jd["structured_text"] if jd else "",
+            "results": results,
+            "pending": pending
         }
-    )
\ No newline at end of file
+    )
+
+
+@app.get("/batches/{batch_id}/status")
+def batch_status(batch_id: str):
+    status = get_batch_status(batch_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Unknown batch")
+    return status
+
+
+@app.post("/analyze/batch", response_model=BatchAnalysisResponse)
+def analyze_batch(
+    jd_texts: List[str] = Form(...),
+    resumes: List[UploadFile] = File(...),
+    thresholds: Optional[List[float]] = Form(None)
+):
+    """
+    Screens one resume pool against several JDs.
+    thresholds: TF-IDF cutoff (%) per JD, or a single value for all of them.
+    """
+    resume_files = []
+    for file in resumes:
+        try:
+            resume_files.append((save_upload(file, UPLOAD_DIR), file.filename))
+        except Exception as e:
+            print(f"Skipping {file.filename}: upload_failed | {e}")
+
+    try:
+        return screen_batch(jd_texts, resume_files, thresholds)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except JDStructuringFailed as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    finally:
+        for file_path, _ in resume_files:
+            discard_upload(file_path)
+
+
+# --------------------------------------------------
+# EXPORT / ANALYTICS
+# --------------------------------------------------
+def _require_jd(jd_hash: str):
+    if not get_jd_by_hash(jd_hash):
+        raise HTTPException(status_code=404, detail="Unknown JD")
+
+
+@app.get("/jds/{jd_hash}/export.csv")
+def export_ranking_csv(jd_hash: str):
+    _require_jd(jd_hash)
+
+    return StreamingResponse(
+        ranking_csv_chunks(iter_ranking_pages(jd_hash, EXPORT_PAGE_SIZE)),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="ranking_{jd_hash[:12]}.csv"'}
+    )
+
+
+@app.get("/jds/{jd_hash}/export.parquet")
+def export_ranking_parquet(jd_hash: str):
+    _require_jd(jd_hash)
+
+    try:
+        chunks = ranking_parquet_chunks(iter_ranking_pages(jd_hash, EXPORT_PAGE_SIZE))
+    except ImportError:
+        raise HTTPException(
+            status_code=501,
+            detail="Parquet export needs pyarrow (pip install pyarrow)"
+        )
+
+    return StreamingResponse(
+        chunks,
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f'attachment; filename="ranking_{jd_hash[:12]}.parquet"'}
+    )
+
+
+@app.get("/jds/{jd_hash}/analytics", response_model=JDAnalytics)
+def jd_analytics(jd_hash: str, skill_gap_limit: int = 20):
+    _require_jd(jd_hash)
+
+    summary = get_requisition_summaries(SHORTLIST_CUTOFF, jd_hash=jd_hash)
+
+    return {
+        "jd_hash": jd_hash,
+        "shortlist_cutoff": SHORTLIST_CUTOFF,
+        "summary": summary[0] if summary else None,
+        "score_distribution": get_score_distribution(jd_hash),
+        "skill_gaps": get_skill_gap_frequency(jd_hash, skill_gap_limit)
+    }
+
+
+@app.get("/analytics/requisitions", response_model=List[RequisitionSummary])
+def requisitions_analytics():
+    return get_requisition_summaries(SHORTLIST_CUTOFF)
@@ -0,0 +1,11 @@
+"""
+Reproducible benchmark suite.
+
+    python -m bench run                       # all scenarios, default sizes
+    python -m bench run -s tfidf -s db_writes --scale 5
+    python -m bench compare old.json new.json
+
+Run from the repository root (app.py resolves static/ and templates/
+relative to the working directory). No Groq key is needed: the HTTP
+scenarios talk to the local fake server in bench/fake_llm.py.
+"""
@@ -0,0 +1,175 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict
+
+from bench.fake_llm import FakeLLMConfig, FakeLLMServer
+
+
+DEFAULT_OUT_DIR = os.path.join("bench", "results")
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def run(args) -> Dict:
+    workdir = tempfile.mkdtemp(prefix="ats-bench-")
+
+    server = FakeLLMServer(FakeLLMConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        seed=args.seed
+    )).start()
+
+    # Must happen before anything imports config.py
+    os.environ["GROQ_API_KEY"] = "bench-fake-key"
+    os.environ["GROQ_BASE_URL"] = server.url
+    os.environ["ATS_DB_PATH"] = os.path.join(workdir, "bench.db")
+    os.environ["REQUEST_DELAY_SECONDS"] = str(args.request_delay)
+
+    from bench.scenarios import SCENARIOS, BenchContext
+    from config import GROQ_MODEL_SMALL
+
+    # The small triage model answers faster and noisier than the large one
+    server.config.model_latency_ms.setdefault(GROQ_MODEL_SMALL, args.latency_ms / 4)
+    server.config.model_noise.setdefault(GROQ_MODEL_SMALL, 8)
+
+    names = args.scenario or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenario(s): {', '.join(unknown)}")
+
+    ctx = BenchContext(workdir=workdir, llm_url=server.url, seed=args.seed)
+    report = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "git_rev": _git_rev(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "params": {
+                "scale": args.scale,
+                "seed": args.seed,
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "rate_429": args.rate_429,
+                "request_delay": args.request_delay,
+            },
+        },
+        "scenarios": {},
+    }
+
+    try:
+        for name in names:
+            print(f"▶ {name} ...", flush=True)
+            start = time.perf_counter()
+
+            log = io.StringIO()
+            redirect = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(log)
+            with redirect:
+                metrics = SCENARIOS[name](ctx, scale=args.scale)
+
+            metrics["wall_s"] = round(time.perf_counter() - start, 3)
+            report["scenarios"][name] = metrics
+            print(f"  done in {metrics['wall_s']}s")
+    finally:
+        report["meta"]["fake_llm"] = server.stats.as_dict()
+        server.stop()
+
+    return report
+
+
+def _flatten(data: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(_flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(old_path: str, new_path: str):
+    with open(old_path) as f:
+        old = _flatten(json.load(f)["scenarios"])
+    with open(new_path) as f:
+        new = _flatten(json.load(f)["scenarios"])
+
+    print(f"{'metric':<50} {'old':>12} {'new':>12} {'change':>9}")
+    for key in sorted(set(old) | set(new)):
+        a, b = old.get(key), new.get(key)
+        if a is None or b is None:
+            change = "n/a"
+        elif a == 0:
+            change = "-"
+        else:
+            change = f"{(b - a) / a * 100:+.1f}%"
+        print(f"{key:<50} {str(a):>12} {str(b):>12} {change:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench")
+    sub = parser.add_subparsers(dest="command")
+
+    run_p = sub.add_parser("run", help="Run benchmark scenarios")
+    run_p.add_argument("-s", "--scenario", action="append",
+                       help="Scenario to run (repeatable, default: all)")
+    run_p.add_argument("--scale", type=float, default=1.0,
+                       help="Multiplier for every scenario's workload size")
+    run_p.add_argument("--seed", type=int, default=0)
+    run_p.add_argument("--latency-ms", type=float, default=50.0,
+                       help="Fake LLM latency per call")
+    run_p.add_argument("--jitter-ms", type=float, default=0.0)
+    run_p.add_argument("--rate-429", type=float, default=0.0,
+                       help="Fraction of fake LLM calls answered with 429")
+    run_p.add_argument("--request-delay", type=float, default=0.0,
+                       help="REQUEST_DELAY_SECONDS used by the app")
+    run_p.add_argument("--out", help="Output JSON path")
+    run_p.add_argument("-v", "--verbose", action="store_true",
+                       help="Show the app's own stdout logging")
+
+    cmp_p = sub.add_parser("compare", help="Diff two result files")
+    cmp_p.add_argument("old")
+    cmp_p.add_argument("new")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        compare(args.old, args.new)
+        return
+
+    if args.command is None:
+        args = run_p.parse_args([])
+
+    report = run(args)
+
+    out = args.out or os.path.join(
+        DEFAULT_OUT_DIR,
+        datetime.utcnow().strftime("%Y%m%dT%H%M%SZ") + ".json"
+    )
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Synthetic resume / JD corpus generator.
+
+Everything is driven by a seeded random.Random, so the same seed and sizes
+always produce byte-identical text (PDF/DOCX containers aside), which keeps
+benchmark runs comparable.
+"""
+import os
+import random
+from typing import Dict, List, Optional
+
+from docx import Document
+
+
+ROLES = [
+    "Backend Engineer", "Frontend Developer", "Data Engineer",
+    "SAP MM Consultant", "L2 Application Support Analyst",
+    "Mainframe Developer", "DevOps Engineer", "ML Engineer",
+]
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "Node.js", "React",
+    "Angular", "SQL", "PostgreSQL", "MySQL", "MongoDB", "Redis", "Kafka",
+    "Spark", "Airflow", "Docker", "Kubernetes", "Terraform", "AWS", "Azure",
+    "GCP", "Jenkins", "Git", "Linux", "Bash", "FastAPI", "Django", "Flask",
+    "Spring Boot", "COBOL", "JCL", "DB2", "CICS", "VSAM", "SAP MM", "SAP SD",
+    "SAP UI5", "ServiceNow", "Grafana", "Prometheus", "Splunk", "scikit-learn",
+    "PyTorch", "TensorFlow", "Pandas", "REST APIs", "GraphQL", "Microservices",
+]
+
+VERBS = [
+    "Designed", "Built", "Migrated", "Maintained", "Optimised", "Automated",
+    "Monitored", "Resolved", "Led", "Documented", "Refactored", "Deployed",
+]
+
+OBJECTS = [
+    "order processing services", "nightly batch jobs", "customer dashboards",
+    "CI/CD pipelines", "incident runbooks", "data ingestion pipelines",
+    "payment reconciliation flows", "reporting APIs", "inventory interfaces",
+    "production alerts", "search indexing workers", "release automation",
+]
+
+FIRST_NAMES = ["Asha", "Ravi", "Maria", "Chen", "Omar", "Lena", "Kiran", "Sam"]
+LAST_NAMES = ["Rao", "Garcia", "Li", "Haddad", "Novak", "Reddy", "Smith", "Okafor"]
+
+FORMATS = ("pdf", "docx", "txt")
+
+
+def _sentence(rng: random.Random, skills: List[str]) -> str:
+    return "{} {} using {} and {}.".format(
+        rng.choice(VERBS),
+        rng.choice(OBJECTS),
+        rng.choice(skills),
+        rng.choice(skills),
+    )
+
+
+def generate_jd_text(seed: int = 0, words: int = 250) -> str:
+    rng = random.Random(f"jd-{seed}")
+    role = rng.choice(ROLES)
+    primary = rng.sample(SKILLS, 5)
+    secondary = rng.sample([s for s in SKILLS if s not in primary], 4)
+    low = rng.randint(2, 6)
+
+    lines = [
+        f"Job Title: {role}",
+        f"Experience: {low}-{low + 4} years",
+        "Primary Skills (Must Have): " + ", ".join(primary),
+        "Nice to Have: " + ", ".join(secondary),
+        "Responsibilities:",
+    ]
+
+    while sum(len(line.split()) for line in lines) < words:
+        lines.append("- " + _sentence(rng, primary + secondary))
+
+    return "\n".join(lines)
+
+
+def generate_resume_text(seed: int = 0, words: int = 500) -> str:
+    rng = random.Random(f"resume-{seed}")
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {seed}"
+    skills = rng.sample(SKILLS, rng.randint(6, 14))
+    years = rng.randint(1, 15)
+
+    lines = [
+        name,
+        f"{rng.choice(ROLES)} | {years} years of experience",
+        "Summary: " + _sentence(rng, skills),
+        "Skills: " + ", ".join(skills),
+        "Experience:",
+    ]
+
+    while sum(len(line.split()) for line in lines) < words:
+        lines.append("- " + _sentence(rng, skills))
+
+    return "\n".join(lines)
+
+
+# --------------------------------------------------
+# WRITERS
+# --------------------------------------------------
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, text: str, lines_per_page: int = 55):
+    """
+    Minimal hand-rolled PDF (Helvetica, one Tj per line) so the corpus
+    needs no PDF writer dependency. pdfplumber reads it like any other PDF.
+    """
+    lines = text.splitlines() or [""]
+    wrapped = []
+    for line in lines:
+        while len(line) > 95:
+            wrapped.append(line[:95])
+            line = line[95:]
+        wrapped.append(line)
+
+    pages = [
+        wrapped[i:i + lines_per_page]
+        for i in range(0, len(wrapped), lines_per_page)
+    ]
+
+    # 1 = catalog, 2 = pages, 3 = font, then (page, content) pairs
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+
+    for index, page_lines in enumerate(pages):
+        page_id = 4 + index * 2
+        content_id = page_id + 1
+        kids.append(f"{page_id} 0 R")
+
+        stream = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in page_lines:
+            stream.append(f"({_pdf_escape(line)}) Tj T*")
+        stream.append("ET")
+        data = "\n".join(stream).encode("latin-1", errors="replace")
+
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {content_id} 0 R >>"
+        ).encode()
+        objects[content_id] = (
+            f"<< /Length {len(data)} >>\nstream\n".encode()
+            + data
+            + b"\nendstream"
+        )
+
+    objects[2] = (
+        f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    ).encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n".encode() + objects[obj_id] + b"\nendobj\n"
+
+    xref_at = len(out)
+    size = max(objects) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+    for obj_id in range(1, size):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {size} /Root 1 0 R >>\n"
+        f"startxref\n{xref_at}\n%%EOF\n"
+    ).encode()
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(path: str, text: str):
+    doc = Document()
+    for line in text.splitlines():
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def write_txt(path: str, text: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+WRITERS = {
+    "pdf": write_pdf,
+    "docx": write_docx,
+    "txt": write_txt,
+}
+
+
+def generate_corpus(
+    out_dir: str,
+    count: int,
+    words: int = 500,
+    formats: Optional[List[str]] = None,
+    seed: int = 0
+) -> List[Dict]:
+    """
+    Writes `count` resumes into out_dir, cycling through `formats`.
+    Returns [{"path", "filename", "format", "text"}, ...].
+    """
+    formats = list(formats or FORMATS)
+    os.makedirs(out_dir, exist_ok=True)
+
+    corpus = []
+    for i in range(count):
+        fmt = formats[i % len(formats)]
+        text = generate_resume_text(seed=seed + i, words=words)
+        filename = f"resume_{seed + i:05d}.{fmt}"
+        path = os.path.join(out_dir, filename)
+
+        WRITERS[fmt](path, text)
+
+        corpus.append({
+            "path": path,
+            "filename": filename,
+            "format": fmt,
+            "text": text,
+        })
+
+    return corpus
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic resume corpus")
+    parser.add_argument("out_dir")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--words", type=int, default=500)
+    parser.add_argument("--formats", default="pdf,docx,txt")
+    parser.add_argument("--jds", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_corpus(
+        args.out_dir,
+        args.count,
+        words=args.words,
+        formats=args.formats.split(","),
+        seed=args.seed
+    )
+
+    for j in range(args.jds):
+        write_txt(
+            os.path.join(args.out_dir, f"jd_{j:03d}.txt"),
+            generate_jd_text(seed=args.seed + j)
+        )
+
+    print(f"Wrote {args.count} resumes and {args.jds} JDs to {args.out_dir}")
@@ -0,0 +1,352 @@
+"""
+Local fake of the Groq / OpenAI chat-completions API.
+
+Answers POST .../chat/completions with canned output chosen from the prompt
+(JD structuring -> JD JSON, resume structuring -> resume JSON, scoring ->
+"<score>\\n<reason>"), after a configurable latency, and rejects a
+configurable fraction of requests with 429 + retry-after like Groq does.
+
+Structured JSON is derived from the input (skills found in the text), and
+scores from the overlap between JD primary skills and resume skills plus
+deterministic per-model noise, so identical inputs get identical scores
+across runs while a "small" model can be made to disagree with a large one.
+
+    python -m bench.fake_llm --port 8900 --latency-ms 300 --rate-429 0.05
+    GROQ_API_KEY=fake GROQ_BASE_URL=http://127.0.0.1:8900 uvicorn app:app
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from bench.corpus import SKILLS
+from llm.prompts import RESUME_STRUCTURING_PROMPT
+
+
+CANNED_JD = {
+    "role_title": "Backend Engineer",
+    "experience_range": {"min_years": 3, "max_years": 7},
+    "primary_skills": ["Python", "SQL", "Docker", "AWS", "REST APIs"],
+    "secondary_skills": ["Kafka", "Redis"],
+    "required_tools_practices": ["Git", "Jenkins"],
+    "evidence_signals": {"expected_work_types": ["Designed reporting APIs"]},
+    "skill_aliases": {"REST APIs": ["REST", "RESTful APIs"]},
+    "skill_type": "technical"
+}
+
+CANNED_RESUME = {
+    "candidate_name": "Synthetic Candidate",
+    "total_years_experience": 5,
+    "skills_present": ["Python", "SQL", "Docker"],
+    "normalized_skills": ["python", "sql", "docker"],
+    "tools_platforms_present": ["Git", "AWS"],
+    "work_types_evidence": ["Built order processing services"],
+    "experience_depth": {},
+    "resume_role_profile": "technical"
+}
+
+CANNED_REASON = (
+    "Moderate primary skill coverage, close but different domain, "
+    "experience meets the range."
+)
+
+
+@dataclass
+class FakeLLMConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    retry_after: float = 0.0
+    seed: int = 0
+    # Optional per-model latency override, e.g. {"llama-3.1-8b-instant": 40}
+    model_latency_ms: Dict[str, float] = field(default_factory=dict)
+    # Max +/- score noise per model (default_noise for unlisted models)
+    default_noise: int = 3
+    model_noise: Dict[str, int] = field(default_factory=dict)
+    jd_json: Dict = field(default_factory=lambda: dict(CANNED_JD))
+    resume_json: Dict = field(default_factory=lambda: dict(CANNED_RESUME))
+    reason: str = CANNED_REASON
+
+
+class FakeLLMStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+        self.by_kind: Dict[str, int] = {}
+
+    def record(self, kind: Optional[str], limited: bool = False):
+        with self.lock:
+            self.requests += 1
+            if limited:
+                self.rate_limited += 1
+            elif kind:
+                self.by_kind[kind] = self.by_kind.get(kind, 0) + 1
+
+    def as_dict(self) -> Dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "rate_limited": self.rate_limited,
+                "by_kind": dict(self.by_kind),
+            }
+
+
+def classify_prompt(content: str) -> str:
+    if "Job Description extractor" in content:
+        return "jd_structuring"
+    if "resume parser" in content:
+        return "resume_structuring"
+    if "ATS scorer" in content:
+        return "scoring"
+    return "other"
+
+
+def _digest_int(*parts) -> int:
+    raw = ":".join(str(p) for p in parts).encode("utf-8")
+    return int.from_bytes(hashlib.sha256(raw).digest()[:4], "big")
+
+
+def stable_score(content: str, seed: int = 0) -> int:
+    return 15 + _digest_int(seed, content) % 76
+
+
+def find_skills(text: str) -> List[str]:
+    lowered = text.lower()
+    return [skill for skill in SKILLS if skill.lower() in lowered]
+
+
+def _split_list(text: str) -> List[str]:
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+def fake_jd_json(content: str, config: FakeLLMConfig) -> Dict:
+    """Canned JD JSON with skills taken from bench.corpus-style JD text when present."""
+    jd = dict(config.jd_json)
+
+    primary = re.search(r"Primary Skills \(Must Have\):\s*(.+?)\s*Nice to Have:", content)
+    secondary = re.search(r"Nice to Have:\s*(.+?)\s*Responsibilities:", content)
+    if primary:
+        jd["primary_skills"] = _split_list(primary.group(1))
+    if secondary:
+        jd["secondary_skills"] = _split_list(secondary.group(1))
+
+    return jd
+
+
+def fake_resume_json(content: str, config: FakeLLMConfig) -> Dict:
+    resume = dict(config.resume_json)
+    # Drop the prompt itself; it names example skills
+    body = content.split(RESUME_STRUCTURING_PROMPT.strip(), 1)[-1]
+    skills = find_skills(body)
+
+    if skills:
+        resume["skills_present"] = skills
+        resume["normalized_skills"] = [s.lower() for s in skills]
+    resume["candidate_name"] = f"Candidate {_digest_int(body) % 100000:05d}"
+
+    return resume
+
+
+def fake_score(content: str, model: str, config: FakeLLMConfig) -> int:
+    """
+    Skill-overlap score (15-90) plus deterministic per-model noise.
+    Falls back to a hash-derived score if the input is not the JSON pair
+    the pipeline sends.
+    """
+    try:
+        jd_part, resume_part = content.split("JOB REQUIREMENTS:", 1)[1].split("CANDIDATE PROFILE:", 1)
+        jd = json.loads(jd_part.strip())
+        resume = json.loads(resume_part.strip())
+    except (IndexError, ValueError):
+        return stable_score(content, config.seed)
+
+    primary = [s.lower() for s in jd.get("primary_skills") or []]
+    present = {s.lower() for s in resume.get("skills_present") or []}
+    matched = sum(1 for s in primary if s in present)
+    base = 15 + round(75 * matched / len(primary)) if primary else 15
+
+    noise = config.model_noise.get(model, config.default_noise)
+    if noise:
+        base += _digest_int(config.seed, model, content) % (2 * noise + 1) - noise
+
+    return min(90, max(15, base))
+
+
+def _handler_factory(config: FakeLLMConfig, stats: FakeLLMStats):
+    rng = random.Random(config.seed)
+    rng_lock = threading.Lock()
+
+    def _uniform() -> float:
+        with rng_lock:
+            return rng.random()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, body: Dict, headers: Optional[Dict] = None):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b"{}"
+
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+
+            try:
+                body = json.loads(raw)
+            except ValueError:
+                self._send_json(400, {"error": {"message": "invalid json"}})
+                return
+
+            if config.rate_429 and _uniform() < config.rate_429:
+                stats.record(None, limited=True)
+                self._send_json(
+                    429,
+                    {"error": {
+                        "message": "Rate limit reached (fake)",
+                        "type": "tokens",
+                        "code": "rate_limit_exceeded"
+                    }},
+                    headers={"retry-after": str(config.retry_after)}
+                )
+                return
+
+            model = body.get("model", "fake-model")
+            content = "\n".join(
+                m.get("content") or "" for m in body.get("messages", [])
+            )
+            kind = classify_prompt(content)
+
+            latency = config.model_latency_ms.get(model, config.latency_ms)
+            if config.jitter_ms:
+                latency += (2 * _uniform() - 1) * config.jitter_ms
+            if latency > 0:
+                time.sleep(latency / 1000.0)
+
+            if kind == "jd_structuring":
+                output = json.dumps(fake_jd_json(content, config))
+            elif kind == "resume_structuring":
+                output = json.dumps(fake_resume_json(content, config))
+            elif kind == "scoring":
+                output = f"{fake_score(content, model, config)}\n{config.reason}"
+            else:
+                output = "READY"
+
+            stats.record(kind)
+
+            prompt_tokens = max(1, len(content) // 4)
+            completion_tokens = max(1, len(output) // 4)
+
+            self._send_json(200, {
+                "id": f"chatcmpl-fake-{stats.requests}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": output},
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens
+                }
+            })
+
+    return Handler
+
+
+class FakeLLMServer:
+    """
+    Threaded fake server; use as a context manager or start()/stop().
+    `url` is what GROQ_BASE_URL should be set to.
+    """
+
+    def __init__(self, config: Optional[FakeLLMConfig] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeLLMConfig()
+        self.stats = FakeLLMStats()
+        self.httpd = ThreadingHTTPServer(
+            (host, port),
+            _handler_factory(self.config, self.stats)
+        )
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever,
+            daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fake Groq/OpenAI chat server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = FakeLLMServer(
+        FakeLLMConfig(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            rate_429=args.rate_429,
+            retry_after=args.retry_after,
+            seed=args.seed
+        ),
+        host=args.host,
+        port=args.port
+    )
+
+    print(f"Fake LLM listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
@@ -0,0 +1,121 @@
+"""
+Result-path memory benchmark: tracemalloc peak and peak RSS against batch
+size for the old list-of-dicts path, the compact ResultCollector path, and
+the bounded top-K path. Each (path, size) runs in a fresh subprocess so
+peak RSS is not inherited from the previous run.
+
+    python -m bench run -s result_memory
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+from typing import Dict
+
+from bench.corpus import generate_resume_text
+
+
+PATHS = ("dicts", "compact", "topk")
+SIZES = (100, 500, 2000)
+TOP_K = 50
+
+
+def _reason(i: int) -> str:
+    # Roughly the length of a real two-line scorer reason
+    return generate_resume_text(seed=i, words=60)[:400]
+
+
+def run_path(path: str, size: int) -> Dict:
+    from jinja2 import Environment, FileSystemLoader
+
+    from db.database import init_db, save_scores_bulk, get_llm_remarks
+    from processing.ranking import ResultRecord, ResultCollector, LazyResults
+
+    init_db()
+    jd_hash = f"memory-bench-{size}"
+    save_scores_bulk([
+        (jd_hash, f"resume-{i}", "llm", 15 + i % 76, _reason(i), None)
+        for i in range(size)
+    ])
+
+    template = Environment(loader=FileSystemLoader("templates")).get_template("results.html")
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+
+    if path == "dicts":
+        results = []
+        for i in range(size):
+            results.append({
+                "name": f"resume_{i:05d}.pdf",
+                "score": 15 + i % 76,
+                "similarity": round((i * 7919) % 10000 / 100, 2),
+                "reason": _reason(i)
+            })
+        results.sort(key=lambda x: (x["score"], x["similarity"]), reverse=True)
+    else:
+        collector = ResultCollector(top_k=TOP_K if path == "topk" else None)
+        for i in range(size):
+            _reason(i)  # the LLM reply exists briefly, then only the record is kept
+            collector.add(ResultRecord(
+                f"resume-{i}",
+                f"resume_{i:05d}.pdf",
+                15 + i % 76,
+                round((i * 7919) % 10000 / 100, 2)
+            ))
+        results = LazyResults(
+            collector.ranked(),
+            lambda hashes: get_llm_remarks(jd_hash, hashes)
+        )
+
+    html = template.render(jd_summary="{}", results=results, screened=size)
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "tracemalloc_peak_kb": round(peak / 1024, 1),
+        "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "maxrss_before_kb": rss_before,
+        "html_kb": round(len(html) / 1024, 1),
+    }
+
+
+def bench_result_memory(ctx, scale: float = 1.0) -> Dict:
+    report = {"top_k": TOP_K}
+
+    for size in (max(1, int(s * scale)) for s in SIZES):
+        row = {}
+        for path in PATHS:
+            out = os.path.join(ctx.workdir, f"memory_{path}_{size}.json")
+            env = dict(
+                os.environ,
+                ATS_DB_PATH=os.path.join(ctx.workdir, f"memory_{path}_{size}.db")
+            )
+            subprocess.run(
+                [sys.executable, "-m", "bench.memory",
+                 "--path", path, "--size", str(size), "--out", out],
+                check=True,
+                env=env,
+                stdout=subprocess.DEVNULL
+            )
+            with open(out) as f:
+                row[path] = json.load(f)
+
+        report[f"size_{size}"] = row
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one result-path memory measurement")
+    parser.add_argument("--path", choices=PATHS, required=True)
+    parser.add_argument("--size", type=int, required=True)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    with open(args.out, "w") as f:
+        json.dump(run_path(args.path, args.size), f)
@@ -0,0 +1,196 @@
+"""
+Tiered-routing report: cost, latency and ranking agreement of each
+ROUTING_MODE against a large-model-only ("off") run on the same corpus.
+
+Each mode runs in its own subprocess with its own database, because
+config.py reads ATS_ROUTING / ATS_DB_PATH at import time and the score
+caches must not leak between modes.
+
+    python -m bench run -s routing
+"""
+import argparse
+import json
+import math
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from bench.corpus import generate_corpus, generate_jd_text
+
+
+MODES = ("off", "llm", "tfidf")
+
+
+# --------------------------------------------------
+# AGREEMENT METRICS
+# --------------------------------------------------
+def kendall_tau(a: List[float], b: List[float]) -> float:
+    """Kendall tau-b (tie-aware) between two paired score lists."""
+    concordant = discordant = ties_a = ties_b = 0
+    n = len(a)
+
+    for i in range(n):
+        for j in range(i + 1, n):
+            da = a[i] - a[j]
+            db = b[i] - b[j]
+            if da == 0 and db == 0:
+                continue
+            if da == 0:
+                ties_a += 1
+            elif db == 0:
+                ties_b += 1
+            elif (da > 0) == (db > 0):
+                concordant += 1
+            else:
+                discordant += 1
+
+    denom = math.sqrt(
+        (concordant + discordant + ties_a) * (concordant + discordant + ties_b)
+    )
+    return (concordant - discordant) / denom if denom else 1.0
+
+
+def shortlist_agreement(baseline: Dict[str, float], other: Dict[str, float], cutoff: float) -> Dict:
+    base = {h for h, s in baseline.items() if s >= cutoff}
+    cand = {h for h, s in other.items() if s >= cutoff}
+    union = base | cand
+
+    return {
+        "baseline_shortlist": len(base),
+        "shortlist": len(cand),
+        "jaccard": round(len(base & cand) / len(union), 4) if union else 1.0,
+        "missed": len(base - cand),
+        "extra": len(cand - base),
+    }
+
+
+def cost_usd(usage: Dict[str, Dict], pricing: Dict[str, tuple]) -> float:
+    total = 0.0
+    for model, stats in usage.items():
+        price_in, price_out = pricing.get(model, (0.0, 0.0))
+        total += stats["prompt_tokens"] / 1e6 * price_in
+        total += stats["completion_tokens"] / 1e6 * price_out
+    return total
+
+
+# --------------------------------------------------
+# ONE MODE (runs inside the subprocess)
+# --------------------------------------------------
+def run_mode(count: int, seed: int, workdir: str) -> Dict:
+    from db.database import init_db, get_connection
+    from llm.hf_runner import get_usage, reset_usage
+    from pipeline import prepare_jd, screen_resume, ResumeSkipped
+
+    init_db()
+    jd = prepare_jd(generate_jd_text(seed=seed))
+    corpus = generate_corpus(workdir, count, words=600, formats=["txt"], seed=seed)
+
+    # Only the per-resume scoring path is compared across modes
+    reset_usage()
+
+    scores = {}
+    latencies = []
+    start = time.perf_counter()
+
+    for item in corpus:
+        t0 = time.perf_counter()
+        try:
+            result = screen_resume(jd, item["path"], item["filename"])
+        except ResumeSkipped:
+            continue
+        latencies.append(time.perf_counter() - t0)
+        scores[result["resume_hash"]] = result["score"]
+
+    wall = time.perf_counter() - start
+
+    conn = get_connection()
+    rows = conn.execute("""
+        SELECT model_name, COUNT(*) AS n FROM scores
+        WHERE jd_hash = ? AND score_type = 'llm'
+        GROUP BY model_name
+    """, (jd["jd_hash"],)).fetchall()
+    conn.close()
+
+    return {
+        "scores": scores,
+        "latencies": latencies,
+        "wall_s": wall,
+        "usage": get_usage(),
+        "final_score_models": {r["model_name"]: r["n"] for r in rows},
+    }
+
+
+# --------------------------------------------------
+# SCENARIO (runs in the bench process)
+# --------------------------------------------------
+def bench_routing(ctx, scale: float = 1.0) -> Dict:
+    from bench.scenarios import summarize
+    from config import MODEL_PRICING, SHORTLIST_CUTOFF
+
+    count = max(2, int(60 * scale))
+    runs = {}
+
+    for mode in MODES:
+        out = os.path.join(ctx.workdir, f"routing_{mode}.json")
+        env = dict(
+            os.environ,
+            ATS_ROUTING=mode,
+            ATS_DB_PATH=os.path.join(ctx.workdir, f"routing_{mode}.db")
+        )
+        subprocess.run(
+            [sys.executable, "-m", "bench.routing",
+             "--count", str(count),
+             "--seed", str(ctx.seed + 40_000),
+             "--workdir", os.path.join(ctx.workdir, "routing_corpus", mode),
+             "--out", out],
+            check=True,
+            env=env,
+            stdout=subprocess.DEVNULL
+        )
+        with open(out) as f:
+            runs[mode] = json.load(f)
+
+    baseline = runs["off"]
+    baseline_cost = cost_usd(baseline["usage"], MODEL_PRICING)
+    report = {"resumes": count, "shortlist_cutoff": SHORTLIST_CUTOFF}
+
+    for mode, run in runs.items():
+        shared = sorted(set(baseline["scores"]) & set(run["scores"]))
+        base_scores = [baseline["scores"][h] for h in shared]
+        mode_scores = [run["scores"][h] for h in shared]
+        cost = cost_usd(run["usage"], MODEL_PRICING)
+
+        report[mode] = {
+            "wall_s": round(run["wall_s"], 3),
+            "latency": summarize(run["latencies"]),
+            "llm_calls": {m: u["calls"] for m, u in run["usage"].items()},
+            "final_score_models": run["final_score_models"],
+            "cost_usd": round(cost, 6),
+            "cost_vs_off": round(cost / baseline_cost, 4) if baseline_cost else None,
+            "kendall_tau_vs_off": round(kendall_tau(base_scores, mode_scores), 4),
+            "mean_abs_diff_vs_off": round(
+                sum(abs(x - y) for x, y in zip(base_scores, mode_scores)) / len(shared), 3
+            ) if shared else None,
+            "shortlist_vs_off": shortlist_agreement(
+                {h: baseline["scores"][h] for h in shared},
+                {h: run["scores"][h] for h in shared},
+                SHORTLIST_CUTOFF
+            ),
+        }
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one routing mode (used by bench_routing)")
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", required=True)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    result = run_mode(args.count, args.seed, args.workdir)
+    with open(args.out, "w") as f:
+        json.dump(result, f)
@@ -0,0 +1,394 @@
+"""
+Benchmark scenarios.
+
+Each scenario is a function (ctx, scale) -> dict of metrics. Project
+modules are imported inside the scenarios because config.py reads its
+environment (DB path, Groq base URL, delays) at import time, and
+bench/__main__.py has to set that up first.
+"""
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from bench.corpus import FORMATS, generate_corpus, generate_jd_text, generate_resume_text
+from bench.memory import bench_result_memory
+from bench.routing import bench_routing
+
+
+@dataclass
+class BenchContext:
+    workdir: str
+    llm_url: str
+    seed: int = 0
+
+
+def summarize(samples: List[float]) -> Dict:
+    """Latency summary in milliseconds for a list of durations in seconds."""
+    if not samples:
+        return {"n": 0}
+
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+    return {
+        "n": len(samples),
+        "total_s": round(sum(samples), 4),
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "p95_ms": round(p95 * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def _n(base: int, scale: float) -> int:
+    return max(1, int(base * scale))
+
+
+# --------------------------------------------------
+# IN-PROCESS SCENARIOS
+# --------------------------------------------------
+def bench_extraction(ctx: BenchContext, scale: float = 1.0) -> Dict:
+    from processing.resume_loader import load_resume_text
+
+    count = _n(30, scale)
+    results = {}
+
+    for fmt in FORMATS:
+        corpus = generate_corpus(
+            os.path.join(ctx.workdir, "extraction", fmt),
+            count,
+            words=600,
+            formats=[fmt],
+            seed=ctx.seed
+        )
+
+        samples = []
+        for item in corpus:
+            start = time.perf_counter()
+            load_resume_text(item["path"])
+            samples.append(time.perf_counter() - start)
+
+        stats = summarize(samples)
+        stats["files_per_s"] = round(len(samples) / stats["total_s"], 2) if stats["total_s"] else None
+        results[fmt] = stats
+
+    return results
+
+
+def bench_tfidf(ctx: BenchContext, scale: float = 1.0) -> Dict:
+    from processing.cleaner import clean_text
+    from processing.tfidf import compute_tfidf_similarity
+
+    count = _n(200, scale)
+    jd = clean_text(generate_jd_text(seed=ctx.seed))
+    resumes = [
+        clean_text(generate_resume_text(seed=ctx.seed + i, words=600))
+        for i in range(count)
+    ]
+
+    samples = []
+    for text in resumes:
+        start = time.perf_counter()
+        compute_tfidf_similarity(jd, text)
+        samples.append(time.perf_counter() - start)
+
+    stats = summarize(samples)
+    stats["pairs_per_s"] = round(len(samples) / stats["total_s"], 2) if stats["total_s"] else None
+    return stats
+
+
+def bench_db_writes(ctx: BenchContext, scale: float = 1.0) -> Dict:
+    from db.database import init_db, save_jd, save_resume, save_score
+    from processing.hasher import get_hash
+
+    count = _n(500, scale)
+    init_db()
+
+    jd_hash = get_hash(f"bench-jd-{time.time_ns()}")
+    save_jd(jd_hash=jd_hash, raw_text="bench", structured_text="{}")
+
+    resume_samples = []
+    score_samples = []
+
+    for i in range(count):
+        resume_hash = get_hash(f"{jd_hash}-{i}")
+
+        start = time.perf_counter()
+        save_resume(
+            resume_hash=resume_hash,
+            filename=f"resume_{i}.txt",
+            raw_text="x" * 2000,
+            structured_text="{}"
+        )
+        resume_samples.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        save_score(
+            jd_hash=jd_hash,
+            resume_hash=resume_hash,
+            score_type="llm",
+            score_value=50,
+            remarks="bench"
+        )
+        score_samples.append(time.perf_counter() - start)
+
+    return {
+        "save_resume": summarize(resume_samples),
+        "save_score": summarize(score_samples),
+    }
+
+
+def bench_export(ctx: BenchContext, scale: float = 1.0) -> Dict:
+    from db.database import init_db, save_scores_bulk, get_combined_scores_for_jd
+    from db.analytics import iter_ranking_pages
+    from processing.export import ranking_csv_chunks
+    from config import EXPORT_PAGE_SIZE
+
+    rows = _n(100_000, scale)
+    init_db()
+
+    jd_hash = f"export-bench-{time.time_ns()}"
+    start = time.perf_counter()
+    save_scores_bulk([
+        (jd_hash, f"resume-{i:07d}", score_type,
+         (15 + i % 76) if score_type == "llm" else round(i % 10000 / 100, 2),
+         "Moderate primary skill coverage, same domain, meets experience." if score_type == "llm" else "bench",
+         None)
+        for i in range(rows)
+        for score_type in ("llm", "tfidf")
+    ])
+    populate = time.perf_counter() - start
+
+    # Streaming CSV export
+    tracemalloc.start()
+    start = time.perf_counter()
+    csv_bytes = sum(
+        len(chunk)
+        for chunk in ranking_csv_chunks(iter_ranking_pages(jd_hash, EXPORT_PAGE_SIZE))
+    )
+    csv_seconds = time.perf_counter() - start
+    _, csv_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Loading the whole ranking at once, for comparison
+    tracemalloc.start()
+    start = time.perf_counter()
+    loaded = len(get_combined_scores_for_jd(jd_hash))
+    load_seconds = time.perf_counter() - start
+    _, load_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "rows": rows,
+        "populate_s": round(populate, 3),
+        "score_writes_per_s": round(2 * rows / populate, 1),
+        "csv_export": {
+            "seconds": round(csv_seconds, 3),
+            "rows_per_s": round(rows / csv_seconds, 1),
+            "bytes": csv_bytes,
+            "tracemalloc_peak_kb": round(csv_peak / 1024, 1),
+        },
+        "full_load": {
+            "rows": loaded,
+            "seconds": round(load_seconds, 3),
+            "tracemalloc_peak_kb": round(load_peak / 1024, 1),
+        },
+    }
+
+
+# --------------------------------------------------
+# HTTP SCENARIOS (app served by uvicorn against the fake LLM)
+# --------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def serve_app():
+    import uvicorn
+    from app import app
+
+    class _ThreadedServer(uvicorn.Server):
+        def install_signal_handlers(self):
+            pass
+
+    port = _free_port()
+    server = _ThreadedServer(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def _post_analyze(base_url: str, jd_text: str, corpus: List[Dict]):
+    import requests
+
+    handles = [open(item["path"], "rb") for item in corpus]
+    try:
+        response = requests.post(
+            base_url + "/analyze",
+            data={"jd_text": jd_text},
+            files=[
+                ("resumes", (item["filename"], handle))
+                for item, handle in zip(corpus, handles)
+            ],
+            timeout=3600
+        )
+        response.raise_for_status()
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def bench_single_request(ctx: BenchContext, scale: float = 1.0) -> Dict:
+    repeats = _n(10, scale)
+    jd_text = generate_jd_text(seed=ctx.seed)
+
+    # Fresh resumes per request so nothing is served from the score cache
+    corpus = generate_corpus(
+        os.path.join(ctx.workdir, "single_request"),
+        repeats,
+        words=600,
+        seed=ctx.seed + 10_000
+    )
+
+    samples = []
+    with serve_app() as base_url:
+        for item in corpus:
+            start = time.perf_counter()
+            _post_analyze(base_url, jd_text, [item])
+            samples.append(time.perf_counter() - start)
+
+    return summarize(samples)
+
+
+def bench_batch_throughput(ctx: BenchContext, scale: float = 1.0) -> Dict:
+    batch = _n(50, scale)
+    jd_text = generate_jd_text(seed=ctx.seed + 1)
+    corpus = generate_corpus(
+        os.path.join(ctx.workdir, "batch_throughput"),
+        batch,
+        words=600,
+        seed=ctx.seed + 20_000
+    )
+
+    with serve_app() as base_url:
+        start = time.perf_counter()
+        _post_analyze(base_url, jd_text, corpus)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "resumes": batch,
+        "total_s": round(elapsed, 3),
+        "resumes_per_s": round(batch / elapsed, 3),
+    }
+
+
+# --------------------------------------------------
+# MULTI-WORKER SCENARIO (worker.py processes against the fake LLM)
+# --------------------------------------------------
+def _queue_drain_seconds(batch_id: str) -> float:
+    """First claim to last completion, from the jobs table (excludes process start-up)."""
+    from db.database import get_connection
+
+    conn = get_connection()
+    row = conn.execute("""
+        SELECT MIN(claimed_at) AS first_claim, MAX(updated_at) AS last_update
+        FROM jobs WHERE batch_id = ?
+    """, (batch_id,)).fetchone()
+    conn.close()
+
+    last = datetime.fromisoformat(row["last_update"]).replace(tzinfo=timezone.utc)
+    return last.timestamp() - row["first_claim"]
+
+
+def bench_worker_scaling(ctx: BenchContext, scale: float = 1.0) -> Dict:
+    from db.database import init_db
+    from db.queue import enqueue_jobs, get_batch_status
+    from pipeline import prepare_jd
+
+    init_db()
+    jobs = _n(40, scale)
+    jd = prepare_jd(generate_jd_text(seed=ctx.seed + 2))
+
+    results = {}
+    baseline = None
+
+    for workers in (1, 2, 4, 8):
+        # New resumes per run so no worker count benefits from the caches
+        corpus = generate_corpus(
+            os.path.join(ctx.workdir, "worker_scaling", str(workers)),
+            jobs,
+            words=600,
+            formats=["txt"],
+            seed=ctx.seed + 30_000 + workers * jobs
+        )
+
+        batch_id = uuid.uuid4().hex
+        enqueue_jobs(batch_id, "screen_resume", [
+            {
+                "jd_hash": jd["jd_hash"],
+                "file_path": item["path"],
+                "filename": item["filename"]
+            }
+            for item in corpus
+        ])
+
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "worker.py",
+             "--processes", str(workers), "--exit-when-idle"],
+            check=True,
+            stdout=subprocess.DEVNULL
+        )
+        wall = time.perf_counter() - start
+
+        drain = _queue_drain_seconds(batch_id)
+        throughput = jobs / drain
+        baseline = baseline or throughput
+
+        results[f"workers_{workers}"] = {
+            "jobs": jobs,
+            "status": get_batch_status(batch_id),
+            "wall_s": round(wall, 3),
+            "drain_s": round(drain, 3),
+            "jobs_per_s": round(throughput, 3),
+            "speedup": round(throughput / baseline, 2),
+            "efficiency": round(throughput / baseline / workers, 2),
+        }
+
+    return results
+
+
+SCENARIOS: Dict[str, Callable[..., Dict]] = {
+    "extraction": bench_extraction,
+    "tfidf": bench_tfidf,
+    "db_writes": bench_db_writes,
+    "export": bench_export,
+    "single_request": bench_single_request,
+    "batch_throughput": bench_batch_throughput,
+    "worker_scaling": bench_worker_scaling,
+    "routing": bench_routing,
+    "result_memory": bench_result_memory,
+}
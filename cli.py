@@ -0,0 +1,79 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+def _collect_resumes(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    files.append((os.path.join(path, name), name))
+        else:
+            files.append((path, os.path.basename(path)))
+    return files
+
+
+def cmd_batch(args):
+    from db.database import init_db
+    from pipeline import JDStructuringFailed, screen_batch
+
+    jd_texts = []
+    for jd_path in args.jd:
+        with open(jd_path, encoding="utf-8", errors="ignore") as f:
+            jd_texts.append(f.read())
+
+    init_db()
+
+    # Pipeline progress logging goes to stderr so stdout stays valid JSON
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            report = screen_batch(
+                jd_texts,
+                _collect_resumes(args.resumes),
+                args.threshold
+            )
+    except (ValueError, JDStructuringFailed) as e:
+        sys.exit(f"Batch screening failed: {e}")
+
+    # Keep the JD file names next to their hashes for readability
+    for jd_path, ranking in zip(args.jd, report["rankings"]):
+        ranking["jd_file"] = jd_path
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"Rankings written to {args.out}")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resume screening from the command line")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    batch = sub.add_parser(
+        "batch",
+        help="Screen a resume pool against several JDs in one pass"
+    )
+    batch.add_argument("resumes", nargs="+",
+                       help="Resume files or directories")
+    batch.add_argument("--jd", action="append", required=True,
+                       help="JD text file (repeat for each requisition)")
+    batch.add_argument("--threshold", type=float, action="append",
+                       help="TF-IDF cutoff (%%); once for all JDs or once per --jd")
+    batch.add_argument("--out", help="Write JSON rankings here instead of stdout")
+    batch.set_defaults(func=cmd_batch)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
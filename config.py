@@ -2,7 +2,11 @@ import os
 
 # GROQ_API_KEY = ""
 
-GROQ_API_KEY = ""
+GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
+
+# Override to point the Groq client at another OpenAI-compatible host
+# (e.g. the fake server in bench/fake_llm.py). None = Groq's public API.
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")
 
 GROQ_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"
 
@@ -10,4 +14,69 @@ GROQ_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"
 
 #GROQ_MODEL = "llama-3.1-8b-instant"
 
-DB_PATH = "db/ats.db"
\ No newline at end of file
+DB_PATH = os.getenv("ATS_DB_PATH", "db/ats.db")
+
+# Pause between LLM calls in /analyze to stay under Groq's rate limits
+REQUEST_DELAY_SECONDS = float(os.getenv("REQUEST_DELAY_SECONDS", "2"))
+
+# Multi-JD batch screening: only JD/resume pairs with TF-IDF similarity (%)
+# at or above this go to the LLM scorer (overridable per request / per JD).
+# On the batch-IDF scale (IDF fitted over the whole batch), not /analyze's.
+BATCH_TFIDF_THRESHOLD = 10.0
+
+# --------------------------------------------------
+# MULTI-WORKER DEPLOYMENT
+# --------------------------------------------------
+# "inline": /analyze screens resumes inside the web request (single worker)
+# "queue":  /analyze enqueues one job per resume; worker.py processes run them
+DEPLOYMENT_MODE = os.getenv("ATS_MODE", "inline")
+
+# How long a SQLite connection waits on another process's write lock
+DB_BUSY_TIMEOUT_SECONDS = 30
+
+# A claimed job is re-queued if its worker stops heartbeating for this long
+JOB_LEASE_SECONDS = 120
+JOB_MAX_ATTEMPTS = 3
+WORKER_POLL_SECONDS = 1.0
+
+# Only one web process per interval runs the model warm-up call
+WARMUP_LOCK_SECONDS = 600
+
+# --------------------------------------------------
+# MODEL ROUTING (llm/router.py)
+# --------------------------------------------------
+GROQ_MODEL_LARGE = GROQ_MODEL
+GROQ_MODEL_SMALL = "llama-3.1-8b-instant"
+
+# Model per prompt type
+MODEL_ROUTES = {
+    "jd_structuring": GROQ_MODEL_LARGE,
+    "resume_structuring": GROQ_MODEL_LARGE,
+    "scoring_triage": GROQ_MODEL_SMALL,
+    "scoring": GROQ_MODEL_LARGE,
+}
+
+# "off":   every pair is scored by the "scoring" model
+# "llm":   the "scoring_triage" model scores first; only close calls
+#          (within ESCALATION_BAND of SHORTLIST_CUTOFF) go to "scoring"
+# "tfidf": pairs under TRIAGE_TFIDF_FLOOR get the minimum score without any
+#          LLM call (the resume is not even structured); the rest go to "scoring"
+ROUTING_MODE = os.getenv("ATS_ROUTING", "off")
+SHORTLIST_CUTOFF = 60
+ESCALATION_BAND = 10
+TRIAGE_TFIDF_FLOOR = 5.0
+
+# USD per 1M tokens (input, output), for routing cost reports.
+# Keep in sync with Groq's pricing page.
+MODEL_PRICING = {
+    "meta-llama/llama-4-scout-17b-16e-instruct": (0.11, 0.34),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+}
+
+# Keep only the best N results of an /analyze upload (None = keep all).
+# Can also be set per request with the top_k form field.
+RESULTS_TOP_K = None
+
+# Rows per keyset page for /jds/{jd_hash}/export.csv|parquet
+EXPORT_PAGE_SIZE = 1000
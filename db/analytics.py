@@ -0,0 +1,140 @@
+from typing import Optional, List, Dict, Iterator
+
+from db.database import get_connection
+
+
+RANKING_COLUMNS = [
+    "resume_hash",
+    "filename",
+    "llm_score",
+    "tfidf_similarity",
+    "llm_model",
+    "llm_remarks",
+]
+
+
+def iter_ranking_pages(jd_hash: str, page_size: int = 1000) -> Iterator[List[Dict]]:
+    """
+    Yields a JD's full ranking, best first, one page at a time.
+
+    Keyset pagination on (sort_score, sort_similarity, resume_hash) keeps every
+    page an index range scan, and a fresh connection per page means the
+    generator can be resumed from any thread (StreamingResponse does that).
+    """
+    last = None
+
+    while True:
+        keyset = ""
+        params = [jd_hash]
+        if last is not None:
+            keyset = "AND (k.sort_score, k.sort_similarity, k.resume_hash) < (?, ?, ?)"
+            params.extend(last)
+        params.append(page_size)
+
+        conn = get_connection()
+        rows = conn.execute(f"""
+            SELECT
+                k.resume_hash,
+                r.filename,
+                k.llm_score,
+                k.tfidf_similarity,
+                k.llm_model,
+                k.llm_remarks,
+                k.sort_score,
+                k.sort_similarity
+            FROM jd_rankings k
+            LEFT JOIN resumes r
+              ON r.resume_hash = k.resume_hash
+            WHERE k.jd_hash = ?
+            {keyset}
+            ORDER BY k.sort_score DESC, k.sort_similarity DESC, k.resume_hash DESC
+            LIMIT ?
+        """, params).fetchall()
+        conn.close()
+
+        if not rows:
+            return
+
+        tail = rows[-1]
+        last = (tail["sort_score"], tail["sort_similarity"], tail["resume_hash"])
+
+        yield [{col: row[col] for col in RANKING_COLUMNS} for row in rows]
+
+        if len(rows) < page_size:
+            return
+
+
+def get_requisition_summaries(
+    shortlist_cutoff: float,
+    jd_hash: Optional[str] = None
+) -> List[Dict]:
+    """
+    Per-JD applicant counts and score statistics (requisition_summary view),
+    plus how many applicants reach the shortlist cutoff.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+
+    jd_filter = "WHERE s.jd_hash = ?" if jd_hash else ""
+    params = [shortlist_cutoff] + ([jd_hash] if jd_hash else [])
+
+    cur.execute(f"""
+        SELECT
+            s.*,
+            (SELECT COUNT(*) FROM jd_rankings k
+              WHERE k.jd_hash = s.jd_hash AND k.sort_score >= ?) AS shortlisted
+        FROM requisition_summary s
+        {jd_filter}
+        ORDER BY s.applicants DESC
+    """, params)
+
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def get_score_distribution(jd_hash: str) -> List[Dict]:
+    conn = get_connection()
+    cur = conn.cursor()
+
+    cur.execute("""
+        SELECT bucket, applicants FROM jd_score_histogram
+        WHERE jd_hash = ? AND applicants > 0
+        ORDER BY bucket
+    """, (jd_hash,))
+
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def get_skill_gap_frequency(jd_hash: str, limit: int = 20) -> List[Dict]:
+    """
+    JD primary skills most often missing among scored applicants.
+    missing_pct is over the applicants whose skills could be checked, which
+    leaves out resumes that were never structured (e.g. TF-IDF triage).
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+
+    cur.execute("""
+        SELECT
+            g.skill,
+            g.missing_count,
+            ROUND(100.0 * g.missing_count / NULLIF(c.checked, 0), 2) AS missing_pct
+        FROM skill_gap_frequency g
+        JOIN (
+            SELECT jd_hash, SUM(skills_checked) AS checked
+            FROM jd_rankings
+            WHERE jd_hash = ?
+            GROUP BY jd_hash
+        ) c
+          ON c.jd_hash = g.jd_hash
+        WHERE g.jd_hash = ?
+        ORDER BY g.missing_count DESC, g.skill
+        LIMIT ?
+    """, (jd_hash, jd_hash, limit))
+
+    rows = cur.fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
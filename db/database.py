@@ -1,13 +1,17 @@
+import json
 import sqlite3
 from datetime import datetime
 from typing import Optional, List, Dict
 
-from config import DB_PATH
+from config import DB_PATH, DB_BUSY_TIMEOUT_SECONDS
 
 
 def get_connection():
-    conn = sqlite3.connect(DB_PATH)
+    # Several web/worker processes share the file: wait on locks instead of
+    # failing with "database is locked".
+    conn = sqlite3.connect(DB_PATH, timeout=DB_BUSY_TIMEOUT_SECONDS)
     conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA synchronous = NORMAL")
     return conn
 
 
@@ -15,6 +19,10 @@ def init_db():
     conn = get_connection()
     cur = conn.cursor()
 
+    # WAL lets readers run alongside the single writer; the mode is stored
+    # in the database file, so setting it once here covers every process.
+    cur.execute("PRAGMA journal_mode = WAL")
+
     # Job Descriptions
     cur.execute("""
         CREATE TABLE IF NOT EXISTS jds (
@@ -44,7 +52,7 @@ def init_db():
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             jd_hash TEXT,
             resume_hash TEXT,
-            score_type TEXT,     -- 'llm' | 'tfidf'
+            score_type TEXT,     -- 'llm' | 'llm_triage' | 'tfidf' | 'tfidf_batch'
             score_value REAL,
             remarks TEXT,
             model_name TEXT,
@@ -53,9 +61,142 @@ def init_db():
         )
     """)
 
+    # --------------------------------------------------
+    # Summary tables, kept current by save_score / save_scores_bulk
+    # --------------------------------------------------
+    # One row per jd x resume: the pivot get_combined_scores_for_jd used to
+    # compute from `scores` on every call. sort_score / sort_similarity are
+    # NULL-free copies of the scores (-1 = missing) for keyset pagination.
+    # skills_checked = 1 once jd_skill_gaps holds this resume's gaps (needs
+    # both structured texts; TF-IDF-triaged resumes are never structured).
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jd_rankings (
+            jd_hash TEXT,
+            resume_hash TEXT,
+            llm_score REAL,
+            tfidf_similarity REAL,
+            llm_remarks TEXT,
+            llm_model TEXT,
+            sort_score REAL NOT NULL DEFAULT -1,
+            sort_similarity REAL NOT NULL DEFAULT -1,
+            skills_checked INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT,
+            PRIMARY KEY (jd_hash, resume_hash)
+        )
+    """)
+
+    # jd_rankings tables created before skills_checked existed
+    ranking_columns = {r["name"] for r in cur.execute("PRAGMA table_info(jd_rankings)")}
+    rankings_outdated = "skills_checked" not in ranking_columns
+    if rankings_outdated:
+        cur.execute("""
+            ALTER TABLE jd_rankings
+            ADD COLUMN skills_checked INTEGER NOT NULL DEFAULT 0
+        """)
+
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_jd_rankings_order
+        ON jd_rankings(jd_hash, sort_score, sort_similarity, resume_hash)
+    """)
+
+    # LLM score histogram per JD, 10-point buckets
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jd_score_histogram (
+            jd_hash TEXT,
+            bucket INTEGER,
+            applicants INTEGER,
+            PRIMARY KEY (jd_hash, bucket)
+        )
+    """)
+
+    # JD primary skills missing from each scored resume
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jd_skill_gaps (
+            jd_hash TEXT,
+            resume_hash TEXT,
+            skill TEXT,
+            PRIMARY KEY (jd_hash, resume_hash, skill)
+        )
+    """)
+
+    cur.execute("""
+        CREATE VIEW IF NOT EXISTS skill_gap_frequency AS
+        SELECT jd_hash, skill, COUNT(*) AS missing_count
+        FROM jd_skill_gaps
+        GROUP BY jd_hash, skill
+    """)
+
+    cur.execute("""
+        CREATE VIEW IF NOT EXISTS requisition_summary AS
+        SELECT
+            jd_hash,
+            COUNT(*) AS applicants,
+            COUNT(llm_score) AS llm_scored,
+            ROUND(AVG(llm_score), 2) AS avg_llm_score,
+            MIN(llm_score) AS min_llm_score,
+            MAX(llm_score) AS max_llm_score,
+            ROUND(AVG(tfidf_similarity), 2) AS avg_tfidf_similarity
+        FROM jd_rankings
+        GROUP BY jd_hash
+    """)
+
+    # Work queue shared by the web process and worker.py (see db/queue.py)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            batch_id TEXT,
+            kind TEXT,           -- 'screen_resume'
+            payload TEXT,        -- JSON
+            status TEXT,         -- 'queued' | 'running' | 'done' | 'failed'
+            attempts INTEGER DEFAULT 0,
+            worker_id TEXT,
+            claimed_at REAL,     -- when the current worker claimed it
+            lease_expires_at REAL,
+            heartbeat_at REAL,
+            result TEXT,         -- JSON
+            error TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+    """)
+
+    # jobs tables created before claimed_at existed
+    job_columns = {r["name"] for r in cur.execute("PRAGMA table_info(jobs)")}
+    if "claimed_at" not in job_columns:
+        cur.execute("ALTER TABLE jobs ADD COLUMN claimed_at REAL")
+
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_jobs_status
+        ON jobs(status, id)
+    """)
+
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_jobs_batch
+        ON jobs(batch_id)
+    """)
+
+    # Cluster-wide "only one process does this" locks (e.g. model warm-up)
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS app_locks (
+            name TEXT PRIMARY KEY,
+            owner TEXT,
+            expires_at REAL
+        )
+    """)
+
     conn.commit()
+
+    # Databases created before the summary tables existed
+    cur.execute("""
+        SELECT EXISTS(SELECT 1 FROM scores)
+           AND NOT EXISTS(SELECT 1 FROM jd_rankings)
+    """)
+    needs_backfill = cur.fetchone()[0] or rankings_outdated
     conn.close()
 
+    if needs_backfill:
+        rebuild_summaries()
+
 
 def save_jd(jd_hash: str, raw_text: str, structured_text: str):
     conn = get_connection()
@@ -91,15 +232,19 @@ def save_resume(
     resume_hash: str,
     filename: str,
     raw_text: str,
-    structured_text: str
+    structured_text: Optional[str]
 ):
     conn = get_connection()
     cur = conn.cursor()
 
+    # A resume may be stored unstructured first (batch screening) and get
+    # its structured_text later, so fill that column in if it is still empty.
     cur.execute("""
-        INSERT OR IGNORE INTO resumes
+        INSERT INTO resumes
         (resume_hash, filename, raw_text, structured_text, created_at)
         VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(resume_hash) DO UPDATE SET
+            structured_text = COALESCE(resumes.structured_text, excluded.structured_text)
     """, (
         resume_hash,
         filename,
@@ -108,6 +253,15 @@ def save_resume(
         datetime.utcnow().isoformat()
     ))
 
+    # Scores saved while the resume was unstructured had no gaps to record
+    if structured_text:
+        cur.execute("""
+            SELECT jd_hash FROM jd_rankings
+            WHERE resume_hash = ? AND llm_score IS NOT NULL AND skills_checked = 0
+        """, (resume_hash,))
+        for row in cur.fetchall():
+            _refresh_skill_gaps(cur, row["jd_hash"], resume_hash)
+
     conn.commit()
     conn.close()
 
@@ -145,6 +299,8 @@ def save_score(
     conn = get_connection()
     cur = conn.cursor()
 
+    now = datetime.utcnow().isoformat()
+
     cur.execute("""
         INSERT OR REPLACE INTO scores
         (jd_hash, resume_hash, score_type, score_value, remarks, model_name, created_at)
@@ -156,9 +312,243 @@ def save_score(
         score_value,
         remarks,
         model_name,
-        datetime.utcnow().isoformat()
+        now
     ))
 
+    _update_summaries(cur, jd_hash, resume_hash, score_type, score_value, remarks, model_name, now)
+
+    conn.commit()
+    conn.close()
+
+
+def save_scores_bulk(rows: List[tuple]):
+    """
+    Writes many scores in one transaction.
+    rows: (jd_hash, resume_hash, score_type, score_value, remarks, model_name)
+    """
+    if not rows:
+        return
+
+    now = datetime.utcnow().isoformat()
+
+    conn = get_connection()
+    cur = conn.cursor()
+
+    cur.executemany("""
+        INSERT OR REPLACE INTO scores
+        (jd_hash, resume_hash, score_type, score_value, remarks, model_name, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """, [row + (now,) for row in rows])
+
+    for row in rows:
+        _update_summaries(cur, *row, now)
+
+    conn.commit()
+    conn.close()
+
+
+# --------------------------------------------------
+# SUMMARY TABLE MAINTENANCE
+# --------------------------------------------------
+def _score_bucket(score: float) -> int:
+    return min(90, int(score // 10) * 10)
+
+
+def _load_structured(text: Optional[str]) -> Dict:
+    """
+    Parses structured LLM output, tolerating markdown fences or extra text.
+    """
+    if not text:
+        return {}
+
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return {}
+
+    try:
+        data = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+
+    return data if isinstance(data, dict) else {}
+
+
+def _missing_primary_skills(jd: Dict, resume: Dict) -> List[str]:
+    present = {
+        str(skill).strip().lower()
+        for key in ("skills_present", "normalized_skills", "tools_platforms_present")
+        for skill in (resume.get(key) or [])
+    }
+
+    aliases = jd.get("skill_aliases")
+    if not isinstance(aliases, dict):
+        aliases = {}
+
+    missing = []
+
+    for skill in jd.get("primary_skills") or []:
+        skill_aliases = aliases.get(skill) or []
+        if isinstance(skill_aliases, str):
+            skill_aliases = [skill_aliases]
+
+        names = [skill] + list(skill_aliases)
+        if not any(str(name).strip().lower() in present for name in names):
+            missing.append(str(skill).strip())
+
+    return missing
+
+
+def _refresh_skill_gaps(cur, jd_hash: str, resume_hash: str):
+    """
+    Rewrites the pair's jd_skill_gaps rows and records in jd_rankings
+    whether they could be worked out (both structured texts parse).
+    """
+    cur.execute("SELECT structured_text FROM jds WHERE jd_hash = ?", (jd_hash,))
+    jd_row = cur.fetchone()
+    cur.execute("SELECT structured_text FROM resumes WHERE resume_hash = ?", (resume_hash,))
+    resume_row = cur.fetchone()
+
+    cur.execute("""
+        DELETE FROM jd_skill_gaps WHERE jd_hash = ? AND resume_hash = ?
+    """, (jd_hash, resume_hash))
+
+    jd = _load_structured(jd_row["structured_text"]) if jd_row else {}
+    resume = _load_structured(resume_row["structured_text"]) if resume_row else {}
+    checked = bool(jd and resume)
+
+    cur.execute("""
+        UPDATE jd_rankings SET skills_checked = ?
+        WHERE jd_hash = ? AND resume_hash = ?
+    """, (int(checked), jd_hash, resume_hash))
+
+    if not checked:
+        return
+
+    cur.executemany("""
+        INSERT OR IGNORE INTO jd_skill_gaps (jd_hash, resume_hash, skill)
+        VALUES (?, ?, ?)
+    """, [
+        (jd_hash, resume_hash, skill)
+        for skill in _missing_primary_skills(jd, resume)
+    ])
+
+
+def _update_summaries(
+    cur,
+    jd_hash: str,
+    resume_hash: str,
+    score_type: str,
+    score_value: float,
+    remarks: str,
+    model_name: Optional[str],
+    now: str
+):
+    """
+    Applies one saved score to jd_rankings, jd_score_histogram and
+    jd_skill_gaps, inside the caller's transaction.
+    """
+    if score_type == "tfidf":
+        cur.execute("""
+            INSERT INTO jd_rankings
+            (jd_hash, resume_hash, tfidf_similarity, sort_similarity, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(jd_hash, resume_hash) DO UPDATE SET
+                tfidf_similarity = excluded.tfidf_similarity,
+                sort_similarity = excluded.sort_similarity,
+                updated_at = excluded.updated_at
+        """, (jd_hash, resume_hash, score_value, score_value, now))
+        return
+
+    # Batch-IDF similarity is not comparable with 'tfidf'; it only makes the
+    # pair part of the JD's ranking
+    if score_type == "tfidf_batch":
+        cur.execute("""
+            INSERT OR IGNORE INTO jd_rankings (jd_hash, resume_hash, updated_at)
+            VALUES (?, ?, ?)
+        """, (jd_hash, resume_hash, now))
+        return
+
+    if score_type != "llm":
+        return
+
+    cur.execute("""
+        SELECT llm_score FROM jd_rankings
+        WHERE jd_hash = ? AND resume_hash = ?
+    """, (jd_hash, resume_hash))
+    previous = cur.fetchone()
+
+    cur.execute("""
+        INSERT INTO jd_rankings
+        (jd_hash, resume_hash, llm_score, llm_remarks, llm_model, sort_score, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(jd_hash, resume_hash) DO UPDATE SET
+            llm_score = excluded.llm_score,
+            llm_remarks = excluded.llm_remarks,
+            llm_model = excluded.llm_model,
+            sort_score = excluded.sort_score,
+            updated_at = excluded.updated_at
+    """, (jd_hash, resume_hash, score_value, remarks, model_name, score_value, now))
+
+    if previous and previous["llm_score"] is not None:
+        cur.execute("""
+            UPDATE jd_score_histogram SET applicants = applicants - 1
+            WHERE jd_hash = ? AND bucket = ?
+        """, (jd_hash, _score_bucket(previous["llm_score"])))
+
+    cur.execute("""
+        INSERT INTO jd_score_histogram (jd_hash, bucket, applicants)
+        VALUES (?, ?, 1)
+        ON CONFLICT(jd_hash, bucket) DO UPDATE SET applicants = applicants + 1
+    """, (jd_hash, _score_bucket(score_value)))
+
+    _refresh_skill_gaps(cur, jd_hash, resume_hash)
+
+
+def rebuild_summaries():
+    """
+    Recomputes every summary table from `scores` (backfill / repair).
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+
+    cur.execute("DELETE FROM jd_rankings")
+    cur.execute("DELETE FROM jd_score_histogram")
+    cur.execute("DELETE FROM jd_skill_gaps")
+
+    cur.execute("""
+        INSERT INTO jd_rankings
+        (jd_hash, resume_hash, llm_score, tfidf_similarity, llm_remarks,
+         llm_model, sort_score, sort_similarity, updated_at)
+        SELECT
+            jd_hash,
+            resume_hash,
+            MAX(CASE WHEN score_type = 'llm' THEN score_value END),
+            MAX(CASE WHEN score_type = 'tfidf' THEN score_value END),
+            MAX(CASE WHEN score_type = 'llm' THEN remarks END),
+            MAX(CASE WHEN score_type = 'llm' THEN model_name END),
+            IFNULL(MAX(CASE WHEN score_type = 'llm' THEN score_value END), -1),
+            IFNULL(MAX(CASE WHEN score_type = 'tfidf' THEN score_value END), -1),
+            MAX(created_at)
+        FROM scores
+        WHERE score_type IN ('llm', 'tfidf', 'tfidf_batch')
+        GROUP BY jd_hash, resume_hash
+    """)
+
+    cur.execute("""
+        INSERT INTO jd_score_histogram (jd_hash, bucket, applicants)
+        SELECT jd_hash, MIN(90, CAST(llm_score / 10 AS INTEGER) * 10), COUNT(*)
+        FROM jd_rankings
+        WHERE llm_score IS NOT NULL
+        GROUP BY 1, 2
+    """)
+
+    cur.execute("""
+        SELECT jd_hash, resume_hash FROM jd_rankings
+        WHERE llm_score IS NOT NULL
+    """)
+    for row in cur.fetchall():
+        _refresh_skill_gaps(cur, row["jd_hash"], row["resume_hash"])
+
     conn.commit()
     conn.close()
 
@@ -182,34 +572,58 @@ def get_score_by_jd_and_resume(jd_hash: str, resume_hash: str, score_type: str)
     return dict(row) if row else None
 
 
-def get_combined_scores_for_jd(jd_hash: str) -> List[Dict]:
+def get_llm_remarks(jd_hash: str, resume_hashes: List[str]) -> Dict[str, str]:
     """
-    Returns one row per resume with LLM score and TF-IDF similarity.
+    LLM reasons for a page of resumes, keyed by resume_hash.
+    Used to fill in results lazily while the results page renders.
     """
     conn = get_connection()
     cur = conn.cursor()
 
     cur.execute("""
-        SELECT
-            r.filename,
+        SELECT resume_hash, remarks FROM scores
+        WHERE jd_hash = ? AND score_type = 'llm'
+          AND resume_hash IN (SELECT value FROM json_each(?))
+    """, (jd_hash, json.dumps(resume_hashes)))
+
+    rows = cur.fetchall()
+    conn.close()
 
-            MAX(CASE WHEN s.score_type = 'llm'
-                     THEN s.score_value END) AS llm_score,
+    return {r["resume_hash"]: r["remarks"] for r in rows}
 
-            MAX(CASE WHEN s.score_type = 'tfidf'
-                     THEN s.score_value END) AS tfidf_similarity,
 
-            MAX(CASE WHEN s.score_type = 'llm'
-                     THEN s.remarks END) AS llm_remarks
+def get_combined_scores_for_jd(
+    jd_hash: str,
+    resume_hashes: Optional[List[str]] = None
+) -> List[Dict]:
+    """
+    Returns one row per resume with LLM score and TF-IDF similarity.
+    Pass resume_hashes to restrict the ranking to one upload batch.
+    Reads the jd_rankings summary table instead of pivoting `scores`.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
 
-        FROM resumes r
-        LEFT JOIN scores s
-          ON r.resume_hash = s.resume_hash
-         AND s.jd_hash = ?
+    resume_filter = ""
+    params = [jd_hash]
+    if resume_hashes is not None:
+        resume_filter = "AND k.resume_hash IN (SELECT value FROM json_each(?))"
+        params.append(json.dumps(resume_hashes))
 
-        GROUP BY r.resume_hash
-        ORDER BY llm_score DESC
-    """, (jd_hash,))
+    cur.execute(f"""
+        SELECT
+            k.resume_hash,
+            r.filename,
+            k.llm_score,
+            k.tfidf_similarity,
+            k.llm_remarks
+        FROM jd_rankings k
+        LEFT JOIN resumes r
+          ON r.resume_hash = k.resume_hash
+        WHERE k.jd_hash = ?
+        {resume_filter}
+        ORDER BY k.sort_score DESC, k.sort_similarity DESC, k.resume_hash DESC
+    """, params)
 
     rows = cur.fetchall()
     conn.close()
@@ -0,0 +1,232 @@
+import json
+import time
+from datetime import datetime
+from typing import Callable, Optional, List, Dict
+
+from db.database import get_connection
+from config import JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS
+
+
+def _now_iso() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _job_to_dict(row) -> Dict:
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"]) if job["payload"] else None
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    return job
+
+
+def enqueue_jobs(batch_id: str, kind: str, payloads: List[Dict]) -> int:
+    conn = get_connection()
+    cur = conn.cursor()
+
+    now = _now_iso()
+    cur.executemany("""
+        INSERT INTO jobs
+        (batch_id, kind, payload, status, attempts, created_at, updated_at)
+        VALUES (?, ?, ?, 'queued', 0, ?, ?)
+    """, [
+        (batch_id, kind, json.dumps(payload), now, now)
+        for payload in payloads
+    ])
+
+    conn.commit()
+    conn.close()
+    return len(payloads)
+
+
+def claim_job(
+    worker_id: str,
+    lease_seconds: float = JOB_LEASE_SECONDS,
+    on_abandoned: Optional[Callable[[Dict], None]] = None
+) -> Optional[Dict]:
+    """
+    Atomically claims the oldest queued job, or a running job whose lease
+    has expired (its worker died or stalled). Returns None if there is no work.
+
+    BEGIN IMMEDIATE takes the database write lock before the SELECT, so two
+    workers can never claim the same row.
+
+    An expired job that is out of attempts is marked failed instead, and
+    passed to on_abandoned (after commit) so the caller can clean up after it.
+    """
+    conn = get_connection()
+    conn.isolation_level = None
+    cur = conn.cursor()
+    abandoned = []
+
+    try:
+        while True:
+            now = time.time()
+            cur.execute("BEGIN IMMEDIATE")
+
+            cur.execute("""
+                SELECT id, attempts FROM jobs
+                WHERE status = 'queued'
+                   OR (status = 'running' AND lease_expires_at < ?)
+                ORDER BY id
+                LIMIT 1
+            """, (now,))
+            row = cur.fetchone()
+
+            if not row:
+                cur.execute("COMMIT")
+                return None
+
+            if row["attempts"] >= JOB_MAX_ATTEMPTS:
+                cur.execute("""
+                    UPDATE jobs
+                    SET status = 'failed', error = 'lease expired too many times',
+                        updated_at = ?
+                    WHERE id = ?
+                """, (_now_iso(), row["id"]))
+                cur.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],))
+                failed = _job_to_dict(cur.fetchone())
+                cur.execute("COMMIT")
+                abandoned.append(failed)
+                continue
+
+            cur.execute("""
+                UPDATE jobs
+                SET status = 'running', worker_id = ?, attempts = attempts + 1,
+                    claimed_at = ?, lease_expires_at = ?, heartbeat_at = ?,
+                    updated_at = ?
+                WHERE id = ?
+            """, (worker_id, now, now + lease_seconds, now, _now_iso(), row["id"]))
+
+            cur.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],))
+            job = _job_to_dict(cur.fetchone())
+
+            cur.execute("COMMIT")
+            return job
+
+    except Exception:
+        if conn.in_transaction:
+            cur.execute("ROLLBACK")
+        raise
+
+    finally:
+        conn.close()
+
+        if on_abandoned:
+            for job in abandoned:
+                on_abandoned(job)
+
+
+def heartbeat_job(job_id: int, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+    """
+    Extends the lease. Returns False if the job is no longer ours
+    (lease expired and another worker reclaimed it).
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+
+    now = time.time()
+    cur.execute("""
+        UPDATE jobs
+        SET lease_expires_at = ?, heartbeat_at = ?
+        WHERE id = ? AND worker_id = ? AND status = 'running'
+    """, (now + lease_seconds, now, job_id, worker_id))
+
+    conn.commit()
+    owned = cur.rowcount == 1
+    conn.close()
+    return owned
+
+
+def complete_job(job_id: int, worker_id: str, result: Dict) -> bool:
+    conn = get_connection()
+    cur = conn.cursor()
+
+    cur.execute("""
+        UPDATE jobs
+        SET status = 'done', result = ?, error = NULL, updated_at = ?
+        WHERE id = ? AND worker_id = ? AND status = 'running'
+    """, (json.dumps(result), _now_iso(), job_id, worker_id))
+
+    conn.commit()
+    owned = cur.rowcount == 1
+    conn.close()
+    return owned
+
+
+def fail_job(job_id: int, worker_id: str, error: str, retry: bool = True) -> Optional[str]:
+    """
+    Marks the job failed, or puts it back in the queue while it still
+    has attempts left and retry is True.
+    Returns the new status ('queued' or 'failed'), or None if the job is
+    no longer ours.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+
+    cur.execute("""
+        UPDATE jobs
+        SET status = CASE
+                WHEN ? AND attempts < ? THEN 'queued'
+                ELSE 'failed'
+            END,
+            error = ?, lease_expires_at = NULL, updated_at = ?
+        WHERE id = ? AND worker_id = ? AND status = 'running'
+    """, (int(retry), JOB_MAX_ATTEMPTS, error, _now_iso(), job_id, worker_id))
+
+    status = None
+    if cur.rowcount == 1:
+        cur.execute("SELECT status FROM jobs WHERE id = ?", (job_id,))
+        status = cur.fetchone()["status"]
+
+    conn.commit()
+    conn.close()
+    return status
+
+
+def get_batch_jobs(batch_id: str) -> List[Dict]:
+    conn = get_connection()
+    cur = conn.cursor()
+
+    cur.execute("SELECT * FROM jobs WHERE batch_id = ? ORDER BY id", (batch_id,))
+    rows = cur.fetchall()
+
+    conn.close()
+    return [_job_to_dict(r) for r in rows]
+
+
+def get_batch_status(batch_id: str) -> Dict[str, int]:
+    conn = get_connection()
+    cur = conn.cursor()
+
+    cur.execute("""
+        SELECT status, COUNT(*) AS n FROM jobs
+        WHERE batch_id = ?
+        GROUP BY status
+    """, (batch_id,))
+    rows = cur.fetchall()
+
+    conn.close()
+    return {r["status"]: r["n"] for r in rows}
+
+
+def try_acquire_lock(name: str, owner: str, ttl_seconds: float) -> bool:
+    """
+    Cluster-wide lock stored in app_locks. True if `owner` now holds it,
+    i.e. it was free, expired, or already ours.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+
+    now = time.time()
+    cur.execute("""
+        INSERT INTO app_locks (name, owner, expires_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(name) DO UPDATE SET
+            owner = excluded.owner,
+            expires_at = excluded.expires_at
+        WHERE app_locks.expires_at < ? OR app_locks.owner = excluded.owner
+    """, (name, owner, now + ttl_seconds, now))
+
+    conn.commit()
+    acquired = cur.rowcount == 1
+    conn.close()
+    return acquired
@@ -1,22 +1,64 @@
+import threading
 import time
+from typing import Dict, Optional
+
 from groq import Groq
-from config import GROQ_API_KEY, GROQ_MODEL
+from config import GROQ_API_KEY, GROQ_BASE_URL, GROQ_MODEL
 
 if not GROQ_API_KEY:
     raise RuntimeError("GROQ_API_KEY is missing. Please set it in config.py")
 
-client = Groq(api_key=GROQ_API_KEY)
+client = Groq(api_key=GROQ_API_KEY, base_url=GROQ_BASE_URL)
+
+# Per-model call/token/latency counters (for routing cost reports)
+_usage: Dict[str, Dict[str, float]] = {}
+_usage_lock = threading.Lock()
+
+
+def _record_usage(model: str, response, seconds: float):
+    usage = getattr(response, "usage", None)
+
+    with _usage_lock:
+        stats = _usage.setdefault(model, {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "seconds": 0.0
+        })
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        if usage is not None:
+            stats["prompt_tokens"] += usage.prompt_tokens or 0
+            stats["completion_tokens"] += usage.completion_tokens or 0
 
 
-def run_llm(prompt: str, content: str, max_tokens: int = 300) -> str:
+def get_usage() -> Dict[str, Dict[str, float]]:
+    with _usage_lock:
+        return {model: dict(stats) for model, stats in _usage.items()}
+
+
+def reset_usage():
+    with _usage_lock:
+        _usage.clear()
+
+
+def run_llm(
+    prompt: str,
+    content: str,
+    max_tokens: int = 300,
+    model: Optional[str] = None
+) -> str:
     """
     Unified LLM call wrapper for Groq.
     Handles retries, trimming, and safe output parsing.
+    model defaults to config.GROQ_MODEL; llm/router.py picks one per prompt type.
     """
 
     if not prompt or not content:
         raise ValueError("Empty prompt or content sent to LLM")
 
+    model = model or GROQ_MODEL
+
     combined_content = (
         prompt.strip() + "\n\n" + content.strip()
     )
@@ -25,8 +67,9 @@ def run_llm(prompt: str, content: str, max_tokens: int = 300) -> str:
 
     for attempt in range(3):
         try:
+            start = time.perf_counter()
             response = client.chat.completions.create(
-                model=GROQ_MODEL,
+                model=model,
                 messages=[
                     {
                         "role": "user",
@@ -36,6 +79,7 @@ def run_llm(prompt: str, content: str, max_tokens: int = 300) -> str:
                 temperature=0,
                 max_tokens=min(max_tokens, 300)
             )
+            _record_usage(model, response, time.perf_counter() - start)
 
             if not response.choices:
                 raise RuntimeError("Groq returned empty choices")
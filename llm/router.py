@@ -0,0 +1,91 @@
+import re
+from typing import List, Optional, Tuple
+
+from llm.prompts import (
+    JD_STRUCTURING_PROMPT,
+    RESUME_STRUCTURING_PROMPT,
+    SCORING_PROMPT
+)
+from config import (
+    GROQ_MODEL,
+    MODEL_ROUTES,
+    ROUTING_MODE,
+    SHORTLIST_CUTOFF,
+    ESCALATION_BAND
+)
+
+
+TASK_PROMPTS = {
+    "jd_structuring": JD_STRUCTURING_PROMPT,
+    "resume_structuring": RESUME_STRUCTURING_PROMPT,
+    "scoring_triage": SCORING_PROMPT,
+    "scoring": SCORING_PROMPT,
+}
+
+# model_name recorded for scores assigned by the TF-IDF floor (no LLM call)
+TFIDF_TRIAGE_MODEL = "tfidf-triage"
+
+
+def model_for(task: str) -> str:
+    return MODEL_ROUTES.get(task, GROQ_MODEL)
+
+
+def route_llm(task: str, content: str, max_tokens: int = 300) -> str:
+    """
+    Runs the prompt for `task` on the model configured for it in MODEL_ROUTES.
+    """
+    # Imported here so the routing rules below load without the Groq client
+    from llm.hf_runner import run_llm
+
+    if task not in TASK_PROMPTS:
+        raise ValueError(f"Unknown LLM task: {task}")
+
+    return run_llm(
+        TASK_PROMPTS[task],
+        content,
+        max_tokens=max_tokens,
+        model=model_for(task)
+    )
+
+
+def parse_llm_score(score_text: str) -> Tuple[Optional[int], str]:
+    """
+    Pulls the 15-90 score and the reason out of the scorer's reply.
+    The score is None if the reply does not contain one.
+    """
+    score_match = re.search(r"\b(1[5-9]|[2-8][0-9]|90)\b", score_text)
+
+    if not score_match:
+        return None, score_text.strip()
+
+    score = int(score_match.group(1))
+    reason = score_text[score_match.end():].strip()
+
+    return min(90, max(15, score)), reason
+
+
+def should_escalate(triage_score: Optional[float]) -> bool:
+    """
+    True if a triage score is close enough to the shortlist cutoff that
+    the large model should decide, or if the triage reply had no score
+    (None) at all.
+    """
+    if triage_score is None:
+        return True
+    return abs(triage_score - SHORTLIST_CUTOFF) <= ESCALATION_BAND
+
+
+def accepted_score_models(routing: Optional[str] = None) -> List[str]:
+    """
+    model_name values whose cached 'llm' score is valid under a routing mode.
+    Switching routing off (or changing a model) re-scores small-tier results.
+    """
+    routing = routing or ROUTING_MODE
+    models = [model_for("scoring")]
+
+    if routing == "llm":
+        models.append(model_for("scoring_triage"))
+    elif routing == "tfidf":
+        models.append(TFIDF_TRIAGE_MODEL)
+
+    return models
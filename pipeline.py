@@ -0,0 +1,550 @@
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from processing.cleaner import clean_text
+from processing.hasher import get_hash
+from processing.resume_loader import load_resume_text
+from processing.tfidf import compute_tfidf_similarity, compute_tfidf_similarity_matrix
+
+from llm.router import (
+    TFIDF_TRIAGE_MODEL,
+    route_llm,
+    parse_llm_score,
+    model_for,
+    should_escalate,
+    accepted_score_models
+)
+
+from db.database import (
+    save_jd,
+    save_resume,
+    save_score,
+    save_scores_bulk,
+    get_jd_by_hash,
+    get_resume_by_hash,
+    get_score_by_jd_and_resume,
+    get_combined_scores_for_jd
+)
+
+from config import (
+    REQUEST_DELAY_SECONDS,
+    BATCH_TFIDF_THRESHOLD,
+    ROUTING_MODE,
+    TRIAGE_TFIDF_FLOOR
+)
+
+
+def throttle():
+    time.sleep(REQUEST_DELAY_SECONDS)
+
+
+class ResumeSkipped(Exception):
+    """
+    The resume could not be read or structured and is left out of the results.
+    """
+
+
+class JDStructuringFailed(Exception):
+    """
+    A batch JD could not be structured (the LLM call failed), so nothing was screened.
+    """
+
+
+def save_upload(file, upload_dir: str) -> str:
+    """
+    Copies an UploadFile to disk and returns the path.
+    The name gets a random prefix so concurrent requests (or workers)
+    uploading the same filename never overwrite each other, so every
+    caller must remove the file with discard_upload() once it is screened.
+    """
+    safe_name = os.path.basename(file.filename or "upload")
+    file_path = os.path.join(upload_dir, f"{uuid.uuid4().hex}_{safe_name}")
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(file.file, f)
+    return file_path
+
+
+def discard_upload(file_path: str):
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+# --------------------------------------------------
+# JD / RESUME PREPARATION
+# --------------------------------------------------
+def prepare_jd(jd_text: str) -> Dict:
+    """
+    Cleans, hashes and structures a JD.
+    The structured JSON is reused from the jds table when the JD was seen before.
+    """
+    jd_clean = clean_text(jd_text)
+    jd_hash = get_hash(jd_clean)
+
+    existing = get_jd_by_hash(jd_hash)
+    if existing and existing["structured_text"]:
+        jd_structured = existing["structured_text"]
+    else:
+        jd_structured = route_llm(
+            "jd_structuring",
+            jd_clean,
+            max_tokens=300
+        )
+
+        save_jd(
+            jd_hash=jd_hash,
+            raw_text=jd_clean,
+            structured_text=jd_structured
+        )
+
+        throttle()
+
+    return {
+        "jd_hash": jd_hash,
+        "clean": jd_clean,
+        "structured": jd_structured
+    }
+
+
+def load_jd(jd_hash: str) -> Dict:
+    """
+    Rebuilds the prepare_jd() dict from the jds table (used by workers).
+    """
+    existing = get_jd_by_hash(jd_hash)
+    if not existing:
+        raise LookupError(f"Unknown JD {jd_hash}")
+
+    return {
+        "jd_hash": jd_hash,
+        "clean": existing["raw_text"],
+        "structured": existing["structured_text"]
+    }
+
+
+def extract_resume(file_path: str) -> Tuple[str, str]:
+    """
+    Returns (clean_text, hash) for a resume file.
+    """
+    resume_raw = load_resume_text(file_path)
+    resume_clean = clean_text(resume_raw)
+    return resume_clean, get_hash(resume_clean)
+
+
+def structure_resume(resume_hash: str, filename: str, resume_clean: str) -> str:
+    """
+    Structures a resume with the LLM unless the resumes table already has it.
+    """
+    existing = get_resume_by_hash(resume_hash)
+    if existing and existing["structured_text"]:
+        return existing["structured_text"]
+
+    resume_structured = route_llm(
+        "resume_structuring",
+        resume_clean,
+        max_tokens=450
+    )
+
+    save_resume(
+        resume_hash=resume_hash,
+        filename=filename,
+        raw_text=resume_clean,
+        structured_text=resume_structured
+    )
+
+    throttle()
+
+    return resume_structured
+
+
+# --------------------------------------------------
+# LLM SCORING
+# --------------------------------------------------
+def _cached_score(
+    jd_hash: str,
+    resume_hash: str,
+    score_type: str,
+    models: List[str]
+) -> Optional[Dict]:
+    existing = get_score_by_jd_and_resume(jd_hash, resume_hash, score_type)
+    if existing and existing["model_name"] in models:
+        return existing
+    return None
+
+
+def _run_scorer(task: str, scoring_input: str) -> Tuple[Optional[int], str]:
+    score_text = route_llm(task, scoring_input, max_tokens=200)
+    throttle()
+    return parse_llm_score(score_text)
+
+
+def tfidf_triage(
+    jd_hash: str,
+    resume_hash: str,
+    tfidf_similarity: float,
+    routing: Optional[str] = None
+) -> Optional[Tuple[int, str]]:
+    """
+    With "tfidf" routing, gives a pair under TRIAGE_TFIDF_FLOOR the minimum
+    score and returns (score, reason); the resume then needs no LLM call at
+    all, not even structuring. Returns None if the pair must go to the LLM.
+    """
+    routing = routing or ROUTING_MODE
+
+    if routing != "tfidf" or tfidf_similarity >= TRIAGE_TFIDF_FLOOR:
+        return None
+
+    existing_score = _cached_score(
+        jd_hash, resume_hash, "llm", accepted_score_models(routing)
+    )
+    if existing_score:
+        return existing_score["score_value"], existing_score["remarks"]
+
+    score = 15
+    reason = f"TF-IDF similarity {tfidf_similarity}% is below the triage floor; not sent to the LLM."
+
+    save_score(
+        jd_hash=jd_hash,
+        resume_hash=resume_hash,
+        score_type="llm",
+        score_value=score,
+        remarks=reason,
+        model_name=TFIDF_TRIAGE_MODEL
+    )
+
+    return score, reason
+
+
+def llm_score(
+    jd_hash: str,
+    resume_hash: str,
+    jd_structured: str,
+    resume_structured: str,
+    routing: Optional[str] = None
+) -> Tuple[int, str]:
+    """
+    Returns (score, reason) for a pair, routed per ROUTING_MODE (see config.py).
+    Cached 'llm' scores are reused only if their model_name is valid for the
+    current routing; 'llm_triage' rows cache the small model's first pass.
+    The "tfidf" floor is applied earlier, by tfidf_triage().
+    Raises if the LLM call fails.
+    """
+    routing = routing or ROUTING_MODE
+
+    existing_score = _cached_score(
+        jd_hash, resume_hash, "llm", accepted_score_models(routing)
+    )
+
+    if existing_score:
+        print(f"✅ Using cached LLM score: {existing_score['score_value']} ({existing_score['model_name']})")
+        return existing_score["score_value"], existing_score["remarks"]
+
+    scoring_input = (
+        "JOB REQUIREMENTS:\n"
+        + jd_structured
+        + "\n\nCANDIDATE PROFILE:\n"
+        + resume_structured
+    )
+
+    if routing == "llm":
+        triage_model = model_for("scoring_triage")
+        triage = _cached_score(jd_hash, resume_hash, "llm_triage", [triage_model])
+
+        if triage:
+            score, reason = triage["score_value"], triage["remarks"]
+        else:
+            score, reason = _run_scorer("scoring_triage", scoring_input)
+            if score is not None:
+                save_score(
+                    jd_hash=jd_hash,
+                    resume_hash=resume_hash,
+                    score_type="llm_triage",
+                    score_value=score,
+                    remarks=reason,
+                    model_name=triage_model
+                )
+
+        model_name = triage_model
+        if should_escalate(score):
+            print(f"↗ Triage score {score} is a close call or unreadable, escalating")
+            try:
+                escalated = _run_scorer("scoring", scoring_input)
+            except Exception as e:
+                # Keep the small model's answer rather than no score at all
+                if score is None:
+                    raise
+                print(f"Escalation failed, keeping triage score {score}: {e}")
+            else:
+                model_name = model_for("scoring")
+                score, reason = escalated
+
+    else:
+        model_name = model_for("scoring")
+        score, reason = _run_scorer("scoring", scoring_input)
+
+    # The large model's reply had no score either: lowest score, as before
+    if score is None:
+        score = 15
+
+    save_score(
+        jd_hash=jd_hash,
+        resume_hash=resume_hash,
+        score_type="llm",
+        score_value=score,
+        remarks=reason,
+        model_name=model_name
+    )
+
+    return score, reason
+
+
+# --------------------------------------------------
+# SINGLE RESUME (used by /analyze and worker.py)
+# --------------------------------------------------
+def screen_resume(jd: Dict, file_path: str, filename: str) -> Dict:
+    """
+    Extracts, structures and scores one resume against a prepared JD
+    (see prepare_jd). Raises ResumeSkipped if it cannot be read or structured;
+    an LLM scoring failure still returns a result with score 0.
+    """
+    try:
+        resume_clean, resume_hash = extract_resume(file_path)
+    except Exception as e:
+        raise ResumeSkipped(f"read_failed | {e}")
+
+    # ---------- TF-IDF Similarity (before any LLM call, for tfidf routing) ----------
+    tfidf_similarity = compute_tfidf_similarity(
+        jd["clean"],
+        resume_clean
+    )
+
+    save_score(
+        jd_hash=jd["jd_hash"],
+        resume_hash=resume_hash,
+        score_type="tfidf",
+        score_value=tfidf_similarity,
+        remarks="TF-IDF cosine similarity"
+    )
+
+    triaged = tfidf_triage(jd["jd_hash"], resume_hash, tfidf_similarity)
+
+    if triaged:
+        score, reason = triaged
+
+        # Stored unstructured so the pair still has a filename in the ranking
+        save_resume(
+            resume_hash=resume_hash,
+            filename=filename,
+            raw_text=resume_clean,
+            structured_text=None
+        )
+
+    else:
+        # ---------- Resume Structuring ----------
+        try:
+            resume_structured = structure_resume(
+                resume_hash,
+                filename,
+                resume_clean
+            )
+        except Exception as e:
+            raise ResumeSkipped(f"structuring_failed | {e}")
+
+        # ---------- LLM Scoring ----------
+        score = 0
+        reason = "LLM scoring failed"
+
+        try:
+            score, reason = llm_score(
+                jd["jd_hash"],
+                resume_hash,
+                jd["structured"],
+                resume_structured
+            )
+        except Exception as e:
+            print(f"LLM scoring failed for {filename}: {e}")
+
+    print("--------------------------------------------------")
+    print(f"Resume     : {filename}")
+    print(f"LLM Score  : {score}")
+    print(f"TF-IDF %   : {tfidf_similarity}")
+    print(f"Reason     : {reason}")
+    print("--------------------------------------------------\n")
+
+    return {
+        "name": filename,
+        "resume_hash": resume_hash,
+        "score": score,
+        "similarity": tfidf_similarity,
+        "reason": reason
+    }
+
+
+# --------------------------------------------------
+# MULTI-JD BATCH SCREENING
+# --------------------------------------------------
+def screen_batch(
+    jd_texts: Sequence[str],
+    resume_files: Sequence[Tuple[str, str]],
+    thresholds: Optional[Sequence[float]] = None
+) -> Dict:
+    """
+    Screens M resumes against N JDs in one pass.
+
+    resume_files: (file_path, filename) pairs.
+    thresholds: per-JD TF-IDF cutoff (%), or a single value for all JDs.
+    Raises ValueError for bad input and JDStructuringFailed if a JD cannot
+    be structured.
+
+    Each resume is extracted once, the full JD x resume TF-IDF matrix is
+    computed in one operation, and only pairs at or above their JD's
+    threshold are sent to the LLM. Resumes are structured lazily, the first
+    time one of their pairs needs scoring.
+
+    The matrix uses IDF over the whole batch, so thresholds and the returned
+    tfidf_similarity are on that scale, not the pairwise /analyze one.
+    """
+    if not jd_texts:
+        raise ValueError("At least one JD is required")
+
+    if not thresholds:
+        thresholds = [BATCH_TFIDF_THRESHOLD]
+    if len(thresholds) == 1:
+        thresholds = list(thresholds) * len(jd_texts)
+    if len(thresholds) != len(jd_texts):
+        raise ValueError("Provide one threshold, or one per JD")
+
+    jds = []
+    for index, text in enumerate(jd_texts, start=1):
+        try:
+            jds.append(prepare_jd(text))
+        except ValueError:
+            # Empty JD text: the caller's input, not the LLM, is at fault
+            raise
+        except Exception as e:
+            raise JDStructuringFailed(f"JD {index} structuring failed: {e}") from e
+
+    # ---------- Extract every resume once ----------
+    resumes = []
+    seen = {}
+    skipped = []
+
+    for file_path, filename in resume_files:
+        try:
+            resume_clean, resume_hash = extract_resume(file_path)
+        except Exception as e:
+            print(f"Skipping {filename}: read_failed | {e}")
+            skipped.append(filename)
+            continue
+
+        if resume_hash in seen:
+            print(f"Skipping {filename}: duplicate of {seen[resume_hash]}")
+            skipped.append(f"{filename} (duplicate of {seen[resume_hash]})")
+            continue
+        seen[resume_hash] = filename
+
+        # Stored unstructured so below-threshold resumes still show up in the ranking
+        save_resume(
+            resume_hash=resume_hash,
+            filename=filename,
+            raw_text=resume_clean,
+            structured_text=None
+        )
+
+        resumes.append({
+            "hash": resume_hash,
+            "filename": filename,
+            "clean": resume_clean,
+            "structured": None,
+            "failed": False
+        })
+
+    rankings = []
+    if not resumes:
+        return {"resumes_processed": 0, "resumes_skipped": skipped, "rankings": rankings}
+
+    # ---------- One similarity matrix for all pairs ----------
+    matrix = compute_tfidf_similarity_matrix(
+        [jd["clean"] for jd in jds],
+        [r["clean"] for r in resumes]
+    )
+
+    # Stored apart from the pairwise 'tfidf' score: the IDF here comes from
+    # the whole batch, so the two values are not comparable
+    save_scores_bulk([
+        (jd["jd_hash"], r["hash"], "tfidf_batch", float(matrix[i][j]),
+         "TF-IDF cosine similarity (batch IDF)", None)
+        for i, jd in enumerate(jds)
+        for j, r in enumerate(resumes)
+    ])
+
+    # ---------- LLM scoring for pairs above threshold ----------
+    scored = [0] * len(jds)
+
+    for i, jd in enumerate(jds):
+        for j, resume in enumerate(resumes):
+            if matrix[i][j] < thresholds[i] or resume["failed"]:
+                continue
+
+            if resume["structured"] is None:
+                try:
+                    resume["structured"] = structure_resume(
+                        resume["hash"],
+                        resume["filename"],
+                        resume["clean"]
+                    )
+                except Exception as e:
+                    # Skip the resume for every remaining JD, not just this one
+                    print(f"Skipping {resume['filename']}: structuring_failed | {e}")
+                    resume["failed"] = True
+                    skipped.append(resume["filename"])
+                    continue
+
+            try:
+                llm_score(
+                    jd["jd_hash"],
+                    resume["hash"],
+                    jd["structured"],
+                    resume["structured"]
+                )
+                scored[i] += 1
+            except Exception as e:
+                print(f"LLM scoring failed for {resume['filename']}: {e}")
+
+    # ---------- Rankings, once every JD is scored ----------
+    # A resume can fail structuring while a later JD is being scored, so
+    # the rankings are only built after the loop above, without it
+    resume_hashes = [r["hash"] for r in resumes if not r["failed"]]
+
+    for i, jd in enumerate(jds):
+        # Report (and break ties on) the batch similarity the threshold used
+        batch_similarity = {r["hash"]: float(matrix[i][j]) for j, r in enumerate(resumes)}
+        results = get_combined_scores_for_jd(jd["jd_hash"], resume_hashes=resume_hashes)
+
+        for row in results:
+            row["tfidf_similarity"] = batch_similarity[row["resume_hash"]]
+
+        results.sort(
+            key=lambda x: (
+                -1 if x["llm_score"] is None else x["llm_score"],
+                x["tfidf_similarity"],
+                x["resume_hash"]
+            ),
+            reverse=True
+        )
+
+        rankings.append({
+            "jd_hash": jd["jd_hash"],
+            "threshold": thresholds[i],
+            "candidates_scored": scored[i],
+            "results": results
+        })
+
+    return {
+        "resumes_processed": sum(1 for r in resumes if not r["failed"]),
+        "resumes_skipped": skipped,
+        "rankings": rankings
+    }
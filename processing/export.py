@@ -0,0 +1,100 @@
+import csv
+import io
+from typing import Dict, Iterable, Iterator, List
+
+
+EXPORT_COLUMNS = [
+    "rank",
+    "resume_hash",
+    "filename",
+    "llm_score",
+    "tfidf_similarity",
+    "llm_model",
+    "llm_remarks",
+]
+
+
+def _ranked(pages: Iterable[List[Dict]]) -> Iterator[List[Dict]]:
+    rank = 0
+    for page in pages:
+        for row in page:
+            rank += 1
+            row["rank"] = rank
+        yield page
+
+
+def ranking_csv_chunks(pages: Iterable[List[Dict]]) -> Iterator[str]:
+    """
+    CSV text, one chunk per page, so only one page is ever in memory.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for page in _ranked(pages):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(page)
+        yield buffer.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file for pyarrow that hands bytes back in chunks.
+    tell() keeps counting across drains, so Parquet footer offsets stay right.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def ranking_parquet_chunks(pages: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """
+    Parquet bytes, one row group per page. Needs pyarrow (optional dependency);
+    raises ImportError before anything is yielded if it is missing.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("rank", pa.int64()),
+        ("resume_hash", pa.string()),
+        ("filename", pa.string()),
+        ("llm_score", pa.float64()),
+        ("tfidf_similarity", pa.float64()),
+        ("llm_model", pa.string()),
+        ("llm_remarks", pa.string()),
+    ])
+
+    def generate():
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+
+        for page in _ranked(pages):
+            writer.write_table(pa.Table.from_pylist(page, schema=schema))
+            yield sink.drain()
+
+        writer.close()
+        yield sink.drain()
+
+    return generate()
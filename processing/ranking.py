@@ -0,0 +1,96 @@
+import heapq
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class ResultRecord:
+    """
+    One screened resume, without its reason text (loaded lazily at render).
+    Ordered by (score, similarity), the same key /analyze has always sorted by.
+    """
+    __slots__ = ("resume_hash", "name", "score", "similarity")
+
+    def __init__(self, resume_hash: str, name: str, score: float, similarity: float):
+        self.resume_hash = resume_hash
+        self.name = name
+        self.score = score
+        self.similarity = similarity
+
+    def sort_key(self):
+        return (self.score, self.similarity, self.resume_hash)
+
+    def __lt__(self, other: "ResultRecord") -> bool:
+        return self.sort_key() < other.sort_key()
+
+
+class ResultCollector:
+    """
+    Collects ResultRecords as resumes finish. With top_k set, only the best
+    k are kept (min-heap), so memory stays flat however large the upload is.
+    """
+
+    def __init__(self, top_k: Optional[int] = None):
+        if top_k is not None and top_k < 1:
+            raise ValueError("top_k must be at least 1")
+
+        self.top_k = top_k
+        self.seen = 0
+        self._records: List[ResultRecord] = []
+
+    def add(self, record: ResultRecord):
+        self.seen += 1
+
+        if self.top_k is None:
+            self._records.append(record)
+        elif len(self._records) < self.top_k:
+            heapq.heappush(self._records, record)
+        elif self._records and self._records[0] < record:
+            heapq.heapreplace(self._records, record)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def ranked(self) -> List[ResultRecord]:
+        """
+        Best first. Consumes the collector's storage.
+        """
+        records, self._records = self._records, []
+        records.sort(reverse=True)
+        return records
+
+
+class LazyResults:
+    """
+    What results.html iterates over: ranked records, with the reason text
+    fetched page by page through `load_reasons(resume_hashes) -> {hash: reason}`
+    while the template renders.
+    """
+
+    def __init__(
+        self,
+        records: List[ResultRecord],
+        load_reasons: Callable[[List[str]], Dict[str, str]],
+        page_size: int = 100,
+        missing_reason: str = "LLM scoring failed"
+    ):
+        self.records = records
+        self.load_reasons = load_reasons
+        self.page_size = page_size
+        self.missing_reason = missing_reason
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for start in range(0, len(self.records), self.page_size):
+            page = self.records[start:start + self.page_size]
+            reasons = self.load_reasons([r.resume_hash for r in page])
+
+            for record in page:
+                # Score 0 marks a failed LLM call (real scores are 15-90)
+                reason = reasons.get(record.resume_hash) if record.score else None
+                yield {
+                    "name": record.name,
+                    "score": record.score,
+                    "similarity": record.similarity,
+                    "reason": reason or self.missing_reason
+                }
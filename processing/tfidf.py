@@ -1,9 +1,24 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.metrics.pairwise import cosine_similarity, linear_kernel
 
 
 def compute_tfidf_similarity(jd_text: str, resume_text: str) -> float:
     vectorizer = TfidfVectorizer(stop_words="english")
     tfidf = vectorizer.fit_transform([jd_text, resume_text])
     similarity = cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0]
-    return round(similarity * 100, 2)
\ No newline at end of file
+    return round(similarity * 100, 2)
+
+
+def compute_tfidf_similarity_matrix(jd_texts, resume_texts):
+    """
+    Similarity (%) of every JD against every resume, shape (len(jd_texts), len(resume_texts)).
+    One vectorizer is fitted on the whole batch, so IDF weights come from all
+    JDs and resumes together rather than from each pair in isolation.
+    """
+    vectorizer = TfidfVectorizer(stop_words="english")
+    tfidf = vectorizer.fit_transform(list(jd_texts) + list(resume_texts))
+
+    n_jds = len(jd_texts)
+    # Rows are L2-normalised, so the sparse dot product is the cosine similarity
+    similarity = linear_kernel(tfidf[:n_jds], tfidf[n_jds:])
+    return (similarity * 100).round(2)
@@ -11,4 +11,55 @@ class ResumeScore(BaseModel):
 
 class AnalysisResponse(BaseModel):
     jd_summary: str
-    results: List[ResumeScore]
\ No newline at end of file
+    results: List[ResumeScore]
+
+
+class RankedResume(BaseModel):
+    resume_hash: str
+    filename: Optional[str] = None
+    llm_score: Optional[float] = None
+    tfidf_similarity: Optional[float] = None
+    llm_remarks: Optional[str] = None
+
+
+class JDRanking(BaseModel):
+    jd_hash: str
+    threshold: float
+    candidates_scored: int
+    results: List[RankedResume]
+
+
+class BatchAnalysisResponse(BaseModel):
+    resumes_processed: int
+    resumes_skipped: List[str]
+    rankings: List[JDRanking]
+
+
+class RequisitionSummary(BaseModel):
+    jd_hash: str
+    applicants: int
+    llm_scored: int
+    shortlisted: int
+    avg_llm_score: Optional[float] = None
+    min_llm_score: Optional[float] = None
+    max_llm_score: Optional[float] = None
+    avg_tfidf_similarity: Optional[float] = None
+
+
+class ScoreBucket(BaseModel):
+    bucket: int
+    applicants: int
+
+
+class SkillGap(BaseModel):
+    skill: str
+    missing_count: int
+    missing_pct: Optional[float] = None
+
+
+class JDAnalytics(BaseModel):
+    jd_hash: str
+    shortlist_cutoff: float
+    summary: Optional[RequisitionSummary] = None
+    score_distribution: List[ScoreBucket]
+    skill_gaps: List[SkillGap]
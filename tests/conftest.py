@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def use_db(path: str):
+    """
+    Points db.database at `path` and creates the schema. get_connection()
+    reads DB_PATH on every call, so this also works in a child process.
+    """
+    import db.database
+
+    db.database.DB_PATH = path
+    db.database.init_db()
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    import db.database
+
+    path = str(tmp_path / "ats.db")
+    monkeypatch.setattr(db.database, "DB_PATH", path)
+    db.database.init_db()
+    return path
@@ -0,0 +1,126 @@
+import multiprocessing
+
+from conftest import use_db
+from db.queue import (
+    enqueue_jobs,
+    claim_job,
+    heartbeat_job,
+    complete_job,
+    fail_job,
+    get_batch_jobs,
+    get_batch_status
+)
+from config import JOB_MAX_ATTEMPTS
+
+
+def _payloads(n):
+    return [{"file_path": f"uploads/{i}.txt", "filename": f"{i}.txt"} for i in range(n)]
+
+
+def _claim_all(args):
+    db_path, worker_id = args
+    use_db(db_path)
+
+    claimed = []
+    while True:
+        job = claim_job(worker_id)
+        if job is None:
+            return claimed
+        claimed.append(job["id"])
+        assert complete_job(job["id"], worker_id, {"ok": True})
+
+
+def test_claims_oldest_queued_job(db_path):
+    enqueue_jobs("b1", "screen_resume", _payloads(2))
+
+    first = claim_job("w1")
+    second = claim_job("w2")
+
+    assert first["id"] < second["id"]
+    assert first["status"] == "running"
+    assert first["worker_id"] == "w1"
+    assert first["attempts"] == 1
+    assert first["claimed_at"] == first["heartbeat_at"]
+    assert first["payload"] == {"file_path": "uploads/0.txt", "filename": "0.txt"}
+    assert claim_job("w3") is None
+
+
+def test_processes_never_claim_the_same_job(db_path):
+    jobs = 200
+    enqueue_jobs("b1", "screen_resume", _payloads(jobs))
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(4) as pool:
+        claimed = pool.map(_claim_all, [(db_path, f"w{i}") for i in range(4)])
+
+    ids = [job_id for worker in claimed for job_id in worker]
+    assert len(ids) == jobs
+    assert len(set(ids)) == jobs
+    assert get_batch_status("b1") == {"done": jobs}
+
+
+def test_expired_lease_is_reclaimed(db_path):
+    enqueue_jobs("b1", "screen_resume", _payloads(1))
+
+    stale = claim_job("w1", lease_seconds=0)
+    reclaimed = claim_job("w2")
+
+    assert reclaimed["id"] == stale["id"]
+    assert reclaimed["worker_id"] == "w2"
+    assert reclaimed["attempts"] == 2
+
+    # The first worker has lost the job
+    assert not heartbeat_job(stale["id"], "w1")
+    assert not complete_job(stale["id"], "w1", {"ok": True})
+    assert fail_job(stale["id"], "w1", "late") is None
+
+    # Heartbeats extend the lease but leave the claim time alone
+    assert heartbeat_job(reclaimed["id"], "w2")
+    [job] = get_batch_jobs("b1")
+    assert job["claimed_at"] == reclaimed["claimed_at"]
+    assert job["heartbeat_at"] >= reclaimed["claimed_at"]
+    assert complete_job(reclaimed["id"], "w2", {"ok": True})
+
+
+def test_lease_expiry_stops_at_max_attempts(db_path):
+    enqueue_jobs("b1", "screen_resume", _payloads(1))
+
+    for attempt in range(JOB_MAX_ATTEMPTS):
+        job = claim_job(f"w{attempt}", lease_seconds=0)
+        assert job["attempts"] == attempt + 1
+
+    abandoned = []
+    assert claim_job("w-last", on_abandoned=abandoned.append) is None
+
+    [job] = get_batch_jobs("b1")
+    assert job["status"] == "failed"
+    assert job["error"] == "lease expired too many times"
+
+    # Handed back once, with its payload, so the worker can delete the upload
+    assert [(j["id"], j["status"], j["payload"]["file_path"]) for j in abandoned] == [
+        (job["id"], "failed", "uploads/0.txt")
+    ]
+
+
+def test_fail_job_requeues_until_attempts_run_out(db_path):
+    enqueue_jobs("b1", "screen_resume", _payloads(1))
+
+    for attempt in range(1, JOB_MAX_ATTEMPTS):
+        job = claim_job("w1")
+        assert fail_job(job["id"], "w1", f"error {attempt}") == "queued"
+
+    job = claim_job("w1")
+    assert job["attempts"] == JOB_MAX_ATTEMPTS
+    assert fail_job(job["id"], "w1", "last error") == "failed"
+
+    assert claim_job("w1") is None
+    [job] = get_batch_jobs("b1")
+    assert job["error"] == "last error"
+
+
+def test_fail_job_without_retry_is_terminal(db_path):
+    enqueue_jobs("b1", "screen_resume", _payloads(1))
+
+    job = claim_job("w1")
+    assert fail_job(job["id"], "w1", "unreadable", retry=False) == "failed"
+    assert claim_job("w1") is None
@@ -0,0 +1,101 @@
+import pytest
+
+from processing.ranking import ResultRecord, ResultCollector, LazyResults
+
+
+def _record(i, score, similarity=0.0):
+    return ResultRecord(f"h{i:03d}", f"resume_{i}.pdf", score, similarity)
+
+
+def _hashes(records):
+    return [r.resume_hash for r in records]
+
+
+def test_collector_ranks_by_score_then_similarity():
+    collector = ResultCollector()
+    collector.add(_record(1, 60, 10.0))
+    collector.add(_record(2, 80, 5.0))
+    collector.add(_record(3, 60, 30.0))
+    collector.add(_record(4, 0, 90.0))
+
+    assert _hashes(collector.ranked()) == ["h002", "h003", "h001", "h004"]
+
+
+def test_top_k_keeps_the_best_k_and_counts_everything_seen():
+    records = [_record(i, 15 + (i * 37) % 76, i % 7) for i in range(200)]
+
+    collector = ResultCollector(top_k=10)
+    for record in records:
+        collector.add(record)
+
+    assert collector.seen == 200
+    assert len(collector) == 10
+
+    expected = sorted(records, reverse=True)[:10]
+    assert _hashes(collector.ranked()) == _hashes(expected)
+
+
+def test_top_k_replaces_the_weakest_kept_record():
+    collector = ResultCollector(top_k=2)
+    collector.add(_record(1, 50))
+    collector.add(_record(2, 70))
+    collector.add(_record(3, 40))   # worse than both, dropped
+    collector.add(_record(4, 60))   # replaces the 50
+
+    assert _hashes(collector.ranked()) == ["h002", "h004"]
+
+
+def test_top_k_larger_than_upload_keeps_everything():
+    collector = ResultCollector(top_k=50)
+    for i in range(3):
+        collector.add(_record(i, 20 + i))
+
+    assert _hashes(collector.ranked()) == ["h002", "h001", "h000"]
+
+
+@pytest.mark.parametrize("top_k", [0, -1])
+def test_top_k_below_one_is_rejected(top_k):
+    with pytest.raises(ValueError):
+        ResultCollector(top_k=top_k)
+
+
+def test_ranked_consumes_the_collector():
+    collector = ResultCollector()
+    collector.add(_record(1, 50))
+
+    assert len(collector.ranked()) == 1
+    assert collector.ranked() == []
+
+
+def test_lazy_results_load_reasons_one_page_at_a_time():
+    records = [_record(i, 90 - i) for i in range(7)]
+    requested = []
+
+    def load_reasons(hashes):
+        requested.append(list(hashes))
+        return {h: f"reason {h}" for h in hashes}
+
+    results = LazyResults(records, load_reasons, page_size=3)
+    assert len(results) == 7
+    assert requested == []  # nothing is loaded before rendering
+
+    rows = list(results)
+
+    assert requested == [_hashes(records[0:3]), _hashes(records[3:6]), _hashes(records[6:7])]
+    assert [row["name"] for row in rows] == [f"resume_{i}.pdf" for i in range(7)]
+    assert rows[0] == {
+        "name": "resume_0.pdf",
+        "score": 90,
+        "similarity": 0.0,
+        "reason": "reason h000",
+    }
+
+
+def test_lazy_results_use_missing_reason_for_failed_or_unknown_scores():
+    records = [_record(1, 0), _record(2, 55), _record(3, 40)]
+
+    # A stale reason for the failed (score 0) record must not be shown
+    reasons = {"h001": "old reason", "h002": "fits"}
+    rows = list(LazyResults(records, lambda hashes: reasons, missing_reason="LLM scoring failed"))
+
+    assert [row["reason"] for row in rows] == ["LLM scoring failed", "fits", "LLM scoring failed"]
@@ -0,0 +1,64 @@
+import pytest
+
+from config import ESCALATION_BAND, SHORTLIST_CUTOFF
+from llm.router import (
+    TFIDF_TRIAGE_MODEL,
+    accepted_score_models,
+    model_for,
+    parse_llm_score,
+    should_escalate
+)
+
+
+@pytest.mark.parametrize("reply, expected", [
+    ("72\nStrong primary skill coverage.", (72, "Strong primary skill coverage.")),
+    ("Score: 15 - weak match", (15, "- weak match")),
+    ("90", (90, "")),
+    ("Candidate has 5 years; score 48. Partial fit.", (48, ". Partial fit.")),
+])
+def test_parse_llm_score_finds_the_score(reply, expected):
+    assert parse_llm_score(reply) == expected
+
+
+@pytest.mark.parametrize("reply", [
+    "I cannot score this candidate.",
+    "Score: 95",
+    "3 of 10 skills matched",
+    "",
+])
+def test_parse_llm_score_returns_none_without_a_score(reply):
+    score, reason = parse_llm_score(reply)
+    assert score is None
+    assert reason == reply.strip()
+
+
+def test_should_escalate_inside_the_band_inclusive():
+    assert should_escalate(SHORTLIST_CUTOFF)
+    assert should_escalate(SHORTLIST_CUTOFF - ESCALATION_BAND)
+    assert should_escalate(SHORTLIST_CUTOFF + ESCALATION_BAND)
+
+
+def test_should_not_escalate_outside_the_band():
+    assert not should_escalate(SHORTLIST_CUTOFF - ESCALATION_BAND - 1)
+    assert not should_escalate(SHORTLIST_CUTOFF + ESCALATION_BAND + 1)
+    assert not should_escalate(15)
+    assert not should_escalate(90)
+
+
+def test_should_escalate_an_unreadable_triage_reply():
+    assert should_escalate(None)
+
+
+def test_accepted_score_models_per_routing_mode():
+    large = model_for("scoring")
+    small = model_for("scoring_triage")
+
+    assert accepted_score_models("off") == [large]
+    assert accepted_score_models("llm") == [large, small]
+    assert accepted_score_models("tfidf") == [large, TFIDF_TRIAGE_MODEL]
+
+
+def test_unknown_task_uses_the_default_model():
+    from config import GROQ_MODEL
+
+    assert model_for("no-such-task") == GROQ_MODEL
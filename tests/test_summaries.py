@@ -0,0 +1,186 @@
+import json
+
+from db.database import (
+    get_connection,
+    save_jd,
+    save_resume,
+    save_score,
+    save_scores_bulk,
+    rebuild_summaries,
+    get_combined_scores_for_jd
+)
+from db.analytics import (
+    iter_ranking_pages,
+    get_requisition_summaries,
+    get_score_distribution,
+    get_skill_gap_frequency
+)
+
+
+def _summary_rows():
+    conn = get_connection()
+    rows = {
+        "rankings": [tuple(r) for r in conn.execute("""
+            SELECT jd_hash, resume_hash, llm_score, tfidf_similarity,
+                   llm_remarks, llm_model, sort_score, sort_similarity,
+                   skills_checked
+            FROM jd_rankings ORDER BY jd_hash, resume_hash
+        """)],
+        "histogram": [tuple(r) for r in conn.execute("""
+            SELECT jd_hash, bucket, applicants FROM jd_score_histogram
+            WHERE applicants > 0 ORDER BY jd_hash, bucket
+        """)],
+        "skill_gaps": [tuple(r) for r in conn.execute("""
+            SELECT jd_hash, resume_hash, skill FROM jd_skill_gaps
+            ORDER BY jd_hash, resume_hash, skill
+        """)],
+    }
+    conn.close()
+    return rows
+
+
+def _flatten(pages):
+    return [row["resume_hash"] for page in pages for row in page]
+
+
+def test_keyset_pages_split_ties_without_gaps_or_repeats(db_path):
+    # Long runs of identical (score, similarity), plus rows with one or
+    # both scores missing, so page boundaries fall inside ties
+    rows = []
+    for i in range(47):
+        resume = f"r{i:03d}"
+        if i % 5 != 4:
+            rows.append(("jd", resume, "llm", 70 if i < 20 else 40, "ok", "m"))
+        if i % 7 != 6:
+            rows.append(("jd", resume, "tfidf", 12.5, "tfidf", None))
+    save_scores_bulk(rows)
+
+    expected = [r["resume_hash"] for r in get_combined_scores_for_jd("jd")]
+    assert len(expected) == len({row[1] for row in rows})
+
+    for page_size in (1, 3, 10, 46, 100):
+        pages = list(iter_ranking_pages("jd", page_size))
+        assert _flatten(pages) == expected
+        assert all(len(page) <= page_size for page in pages)
+
+
+def test_keyset_pages_stay_within_one_jd(db_path):
+    save_scores_bulk([
+        (jd, f"r{i}", "llm", 50, "ok", "m")
+        for jd in ("jd-a", "jd-b")
+        for i in range(5)
+    ])
+
+    pages = list(iter_ranking_pages("jd-a", 2))
+    assert _flatten(pages) == [f"r{i}" for i in reversed(range(5))]
+
+
+def test_replaced_score_moves_between_histogram_buckets(db_path):
+    save_score("jd", "r1", "llm", 72, "first", "small")
+    save_score("jd", "r2", "llm", 75, "other", "small")
+    save_score("jd", "r1", "llm", 45, "rescored", "large")
+
+    assert get_score_distribution("jd") == [
+        {"bucket": 40, "applicants": 1},
+        {"bucket": 70, "applicants": 1},
+    ]
+
+    [summary] = get_requisition_summaries(60, jd_hash="jd")
+    assert summary["applicants"] == 2
+    assert summary["llm_scored"] == 2
+    assert summary["shortlisted"] == 1
+
+    ranked = get_combined_scores_for_jd("jd")
+    assert [(r["resume_hash"], r["llm_score"], r["llm_remarks"]) for r in ranked] == [
+        ("r2", 75, "other"),
+        ("r1", 45, "rescored"),
+    ]
+
+
+def test_top_bucket_includes_the_maximum_score(db_path):
+    save_score("jd", "r1", "llm", 90, "ok", "m")
+    save_score("jd", "r2", "llm", 95, "ok", "m")
+
+    assert get_score_distribution("jd") == [{"bucket": 90, "applicants": 2}]
+
+
+def test_batch_tfidf_does_not_replace_pairwise_similarity(db_path):
+    save_score("jd", "r1", "tfidf", 12.0, "pairwise")
+    save_scores_bulk([
+        ("jd", "r1", "tfidf_batch", 30.0, "batch", None),
+        ("jd", "r2", "tfidf_batch", 8.0, "batch", None),
+    ])
+
+    ranked = {r["resume_hash"]: r for r in get_combined_scores_for_jd("jd")}
+    assert ranked["r1"]["tfidf_similarity"] == 12.0
+    assert ranked["r2"]["tfidf_similarity"] is None
+
+
+def test_skill_gaps_count_each_resume_once(db_path):
+    save_jd("jd", "jd text", json.dumps({
+        "primary_skills": ["Python", "REST APIs", "Docker"],
+        "skill_aliases": {"REST APIs": ["REST"]}
+    }))
+    save_resume("r1", "r1.txt", "resume", json.dumps({"skills_present": ["python", "REST"]}))
+    save_resume("r2", "r2.txt", "resume", json.dumps({"skills_present": ["Go"]}))
+
+    save_score("jd", "r1", "llm", 60, "ok", "m")
+    save_score("jd", "r2", "llm", 20, "ok", "m")
+
+    gaps = {g["skill"]: g["missing_count"] for g in get_skill_gap_frequency("jd")}
+    assert gaps == {"Docker": 2, "Python": 1, "REST APIs": 1}
+
+    # Re-scoring must not count the same resume's gaps twice
+    save_score("jd", "r2", "llm", 25, "ok", "m")
+    gaps = {g["skill"]: g["missing_count"] for g in get_skill_gap_frequency("jd")}
+    assert gaps == {"Docker": 2, "Python": 1, "REST APIs": 1}
+
+
+def test_tfidf_triaged_resumes_stay_out_of_the_gap_denominator(db_path):
+    save_jd("jd", "jd text", json.dumps({"primary_skills": ["Python", "Docker"]}))
+
+    # Scored by the LLM after structuring
+    save_resume("r1", "r1.txt", "resume", json.dumps({"skills_present": ["Python"]}))
+    save_score("jd", "r1", "llm", 55, "ok", "large")
+
+    # tfidf_triage: floor score first, then the resume is stored unstructured
+    save_score("jd", "r2", "llm", 15, "below floor", "tfidf-triage")
+    save_resume("r2", "r2.txt", "resume", None)
+
+    [summary] = get_requisition_summaries(60, jd_hash="jd")
+    assert summary["llm_scored"] == 2
+    assert get_skill_gap_frequency("jd") == [
+        {"skill": "Docker", "missing_count": 1, "missing_pct": 100.0},
+    ]
+
+    # Structured later (e.g. screened for another JD): its gaps now count
+    save_resume("r2", "r2.txt", "resume", json.dumps({"skills_present": ["Go"]}))
+    assert get_skill_gap_frequency("jd") == [
+        {"skill": "Docker", "missing_count": 2, "missing_pct": 100.0},
+        {"skill": "Python", "missing_count": 1, "missing_pct": 50.0},
+    ]
+
+    incremental = _summary_rows()
+    rebuild_summaries()
+    assert _summary_rows() == incremental
+
+
+def test_incremental_summaries_match_a_full_rebuild(db_path):
+    save_jd("jd", "jd text", json.dumps({"primary_skills": ["Python", "SQL"]}))
+    for i in range(12):
+        save_resume(f"r{i}", f"r{i}.txt", "resume", json.dumps(
+            {"skills_present": ["Python"] if i % 2 else ["SQL"]}
+        ))
+
+    for i in range(12):
+        save_score("jd", f"r{i}", "tfidf", float(i), "tfidf")
+        if i % 3:
+            save_score("jd", f"r{i}", "llm", 15 + 7 * i, "first", "small")
+    for i in range(0, 12, 4):
+        save_score("jd", f"r{i}", "llm", 88 - i, "rescored", "large")
+    save_scores_bulk([("jd", f"r{i}", "tfidf_batch", 1.0, "batch", None) for i in range(14)])
+
+    incremental = _summary_rows()
+    rebuild_summaries()
+
+    assert _summary_rows() == incremental
@@ -0,0 +1,141 @@
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from typing import Optional
+
+from config import JOB_LEASE_SECONDS, WORKER_POLL_SECONDS
+
+
+def _heartbeat_loop(job_id: int, worker_id: str, stop: threading.Event):
+    from db.queue import heartbeat_job
+
+    while not stop.wait(JOB_LEASE_SECONDS / 3):
+        if not heartbeat_job(job_id, worker_id):
+            print(f"[{worker_id}] lost lease on job {job_id}")
+            return
+
+
+def discard_job_upload(job: dict):
+    from pipeline import discard_upload
+
+    file_path = (job["payload"] or {}).get("file_path")
+    if file_path:
+        discard_upload(file_path)
+
+
+def process_job(job: dict) -> dict:
+    from pipeline import load_jd, screen_resume
+
+    if job["kind"] != "screen_resume":
+        raise ValueError(f"Unknown job kind: {job['kind']}")
+
+    payload = job["payload"]
+    return screen_resume(
+        load_jd(payload["jd_hash"]),
+        payload["file_path"],
+        payload["filename"]
+    )
+
+
+def run_worker(
+    worker_id: Optional[str] = None,
+    max_jobs: Optional[int] = None,
+    exit_when_idle: bool = False
+) -> int:
+    """
+    Claims and runs jobs until max_jobs is reached, or forever
+    (or until the queue is empty with exit_when_idle). Returns jobs processed.
+    """
+    from db.database import init_db
+    from db.queue import claim_job, complete_job, fail_job
+    from pipeline import ResumeSkipped
+
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    init_db()
+
+    processed = 0
+    print(f"[{worker_id}] started")
+
+    while max_jobs is None or processed < max_jobs:
+        # Jobs that failed for good by running out of leases lose their upload too
+        job = claim_job(worker_id, on_abandoned=discard_job_upload)
+
+        if job is None:
+            if exit_when_idle:
+                break
+            time.sleep(WORKER_POLL_SECONDS)
+            continue
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=_heartbeat_loop,
+            args=(job["id"], worker_id, stop),
+            daemon=True
+        )
+        heartbeat.start()
+
+        # The upload is deleted once the job is finished for good; a job that
+        # goes back to the queue (or was reclaimed by another worker) still needs it
+        finished = False
+        try:
+            result = process_job(job)
+            finished = complete_job(job["id"], worker_id, result)
+        except ResumeSkipped as e:
+            # Unreadable / unstructurable resume: retrying will not help
+            finished = fail_job(job["id"], worker_id, str(e), retry=False) == "failed"
+        except Exception as e:
+            print(f"[{worker_id}] job {job['id']} failed: {e}")
+            finished = fail_job(job["id"], worker_id, str(e)) == "failed"
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        if finished:
+            discard_job_upload(job)
+
+        processed += 1
+
+    print(f"[{worker_id}] stopped after {processed} job(s)")
+    return processed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run screening jobs from the shared SQLite queue (no web server)"
+    )
+    parser.add_argument("--processes", type=int, default=1,
+                        help="Worker processes to start on this host")
+    parser.add_argument("--worker-id",
+                        help="Worker id prefix (default: hostname:pid)")
+    parser.add_argument("--max-jobs", type=int,
+                        help="Stop each process after this many jobs")
+    parser.add_argument("--exit-when-idle", action="store_true",
+                        help="Stop once the queue is empty")
+    args = parser.parse_args(argv)
+
+    def worker_id(index):
+        return f"{args.worker_id}-{index}" if args.worker_id else None
+
+    if args.processes == 1:
+        run_worker(worker_id(0), args.max_jobs, args.exit_when_idle)
+        return
+
+    processes = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(worker_id(i), args.max_jobs, args.exit_when_idle)
+        )
+        for i in range(args.processes)
+    ]
+
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()